@@ -0,0 +1,239 @@
+from heapq import heapify, heappop, heappush
+from numbers import Integral
+from Hotel_pkg.Instrumentation import instrumentation
+
+
+def _max_revenue_flow(supply, free, arcs):
+    """
+    Solves the transportation problem behind an allocation as a min-cost flow.
+
+    Successive shortest paths push requests from their class to a room type, most
+    profitable path first, and stop once no path adds revenue. Costs are negated revenues
+    in cents, so the result is exact and integral.
+
+    A residual path enters a room type from a class with requests left, may move an
+    assigned class on to other types, and leaves to the sink from a type with free rooms;
+    so only room types need distances. The cheapest entry into each type and the cheapest
+    move between each pair of types are kept in heaps keyed by their fixed costs, with
+    stale classes dropped when they reach the top, and each path is found by Bellman-Ford
+    over the few room types. The work per path does not grow with the number of classes.
+
+    Args:
+        supply (list): Number of requests of each class.
+        free (list): Number of free rooms of each type code.
+        arcs (list): (class, type code, revenue in cents) of every allowed assignment.
+
+    Returns:
+        dict: {(class, type code): number of requests assigned}.
+    """
+    types = len(free)
+    left = list(supply)                 # Requests of each class not assigned yet
+    rooms_left = list(free)             # Free rooms of each type not assigned yet
+    revenue = {}                        # Revenue in cents of each (class, type) arc
+    types_of = [[] for _ in supply]     # Types each class may be assigned to
+    flows = {}                          # Requests assigned on each (class, type) arc
+
+    entries = [[] for _ in range(types)]                        # (cost, class) into each type
+    moves = [[[] for _ in range(types)] for _ in range(types)]  # (cost, class) from one type to another
+    for c, t, cents in arcs:
+        if free[t]:
+            revenue[(c, t)] = cents
+            types_of[c].append(t)
+            entries[t].append((-cents, c))
+    for heap in entries:
+        heapify(heap)
+
+    while True:
+        # Cheapest entry into each type, then cheapest moves between types
+        distance, parent = [None] * types, [None] * types
+        for t, heap in enumerate(entries):
+            while heap and not left[heap[0][1]]:
+                heappop(heap)
+            if heap:
+                distance[t], parent[t] = heap[0][0], (None, heap[0][1])
+        best_moves = [[None] * types for _ in range(types)]
+        for t, row in enumerate(moves):
+            for u, heap in enumerate(row):
+                while heap and not flows.get((heap[0][1], t)):
+                    heappop(heap)
+                if heap:
+                    best_moves[t][u] = heap[0]
+        for _ in range(types - 1):
+            changed = False
+            for t in range(types):
+                if distance[t] is None:
+                    continue
+                for u, move in enumerate(best_moves[t]):
+                    if move is not None and (distance[u] is None or distance[t] + move[0] < distance[u]):
+                        distance[u], parent[u] = distance[t] + move[0], (t, move[1])
+                        changed = True
+            if not changed:
+                break
+
+        end = None
+        for t in range(types):
+            if rooms_left[t] and distance[t] is not None and (end is None or distance[t] < distance[end]):
+                end = t
+        if end is None or distance[end] >= 0:
+            break
+
+        # Steps of the path, last first, and their bottleneck
+        steps, t = [], end
+        while True:
+            previous, c = parent[t]
+            steps.append((previous, c, t))
+            if previous is None:
+                break
+            t = previous
+        amount = min(rooms_left[end], left[steps[-1][1]],
+                     *(flows[(c, previous)] for previous, c, _ in steps if previous is not None))
+
+        rooms_left[end] -= amount
+        for previous, c, t in steps:
+            if previous is None:
+                left[c] -= amount
+            else:
+                flows[(c, previous)] -= amount
+            assigned = flows.get((c, t), 0)
+            flows[(c, t)] = assigned + amount
+            if not assigned:
+                for u in types_of[c]:
+                    if u != t:
+                        heappush(moves[t][u], (revenue[(c, t)] - revenue[(c, u)], c))
+
+    return {key: amount for key, amount in flows.items() if amount}
+
+
+class BatchAllocator:
+    """
+    Revenue-maximizing allocation of a batch of booking requests to a hotel's free rooms.
+
+    `Guest.book_room` serves requests one by one, first come first served. When rooms
+    are scarce, a batch can earn more by giving the rooms to the longest stays and by
+    moving guests to other acceptable types. Each request names a room type and its
+    nights, and optionally other types the guest accepts at their own price; with
+    `upgrades`, a guest can also get any pricier type at the price of the one requested.
+
+    Requests with the same nights, room type and accepted types are interchangeable,
+    so a batch is grouped into classes and solved exactly as a min-cost flow from classes
+    to room types (`_max_revenue_flow`). The number of classes grows with the distinct
+    stay lengths but not with the number of requests, and each augmenting path takes
+    heap operations plus work in the number of room types. Within a class, earlier
+    requests are served first.
+
+    The whole batch is quoted at the prices in force when it starts: a booking of the
+    batch that moves a type to another occupancy band reprices the type for later
+    clients, not for the rest of the batch, whose prices the optimal allocation assumed.
+    """
+
+    def __init__(self, hotel, upgrades=True):
+        """
+        Args:
+            hotel (Hotel): Hotel whose current inventory and prices are allocated.
+            upgrades (bool): If True, requests may be upgraded to pricier room types for free.
+        """
+        self.hotel = hotel
+        self.upgrades = upgrades
+
+    def allocate(self, nights, room_types, acceptable=None, book=True):
+        """
+        Assigns a batch of requests to room types so the revenue of the stays is maximal.
+
+        Args:
+            nights (sequence): Nights of each request.
+            room_types (sequence): Room type requested by each request.
+            acceptable (sequence, optional): Other room types each request accepts, paid at their
+                                             own price (an iterable per request, or None).
+            book (bool): If True, the assigned rooms are booked with `Hotel.book_room`; a room taken
+                         meanwhile by another client rejects its request as "not_available".
+
+        Returns:
+            dict: Per request, "room_types" (assigned type, None if rejected), "room_ids" (None if
+                  rejected or not booked), "prices" (total stay price, None if rejected) and "reasons"
+                  (None if accepted, else "invalid_request", "unknown_room_type" or "not_available");
+                  plus the total "revenue". Prices are those in force when the call starts.
+        """
+        store = self.hotel.rooms
+        type_codes, type_names = store.type_codes, store.type_names
+        prices = list(store.prices)
+        free = [len(stack) for stack in store.free]
+        count = len(room_types)
+        reasons = [None] * count
+
+        # Group interchangeable requests into classes
+        classes = {}
+        for i, (stay, room_type) in enumerate(zip(nights, room_types)):
+            others = acceptable[i] if acceptable is not None else None
+            key = (stay, room_type, tuple(others) if others else ())
+            members = classes.get(key)
+            if members is None:
+                members = classes[key] = []
+            members.append(i)
+
+        supply, members_of, arcs, charged = [], [], [], {}
+        for (stay, room_type, others), members in classes.items():
+            code = type_codes.get(room_type)
+            if not isinstance(stay, Integral) or stay <= 0 or code is None:
+                reason = "invalid_request" if not isinstance(stay, Integral) or stay <= 0 else "unknown_room_type"
+                for i in members:
+                    reasons[i] = reason
+                continue
+            c = len(supply)
+            supply.append(len(members))
+            members_of.append(members)
+
+            # Price each allowed type would be charged at; the better rule wins when both apply
+            options = {code: prices[code]}
+            for other in others:
+                other_code = type_codes.get(other)
+                if other_code is not None:
+                    options[other_code] = prices[other_code]
+            if self.upgrades:
+                for other_code, price in enumerate(prices):
+                    if price > prices[code] and options.get(other_code, 0.0) < prices[code]:
+                        options[other_code] = prices[code]
+            for t, price in options.items():
+                total = round(price * stay, 2)
+                charged[(c, t)] = total
+                arcs.append((c, t, round(total * 100)))
+
+        assigned_types = [None] * count
+        room_ids = [None] * count
+        totals = [None] * count
+        served = [0] * len(supply)      # Requests of each class handed out so far, in request order
+        flows = _max_revenue_flow(supply, free, arcs) if supply else {}
+        # Most profitable assignments first, so rooms taken meanwhile by other clients cost the least
+        for (c, t), amount in sorted(flows.items(), key=lambda item: -charged[item[0]]):
+            room_type, total = type_names[t], charged[(c, t)]
+            for i in members_of[c][served[c]:served[c] + amount]:
+                room_id = self.hotel.book_room(room_type) if book else None
+                if book and room_id is None:
+                    reasons[i] = "not_available"
+                else:
+                    assigned_types[i], room_ids[i], totals[i] = room_type, room_id, total
+            served[c] += amount
+        for c, members in enumerate(members_of):
+            for i in members[served[c]:]:
+                reasons[i] = "not_available"
+
+        revenue = round(sum(total for total in totals if total is not None), 2)
+        if instrumentation.active:
+            instrumentation.emit("batch_allocation", hotel=self.hotel.name, requests=count,
+                                 accepted=count - sum(1 for reason in reasons if reason), revenue=revenue)
+        return {"room_types": assigned_types, "room_ids": room_ids, "prices": totals,
+                "reasons": reasons, "revenue": revenue}
+
+    def allocate_guests(self, guests, acceptable=None, book=True):
+        """
+        Allocates a batch of `Guest` requests with `allocate`.
+
+        Args:
+            guests (list): Guests, each requesting its `room_type` for its `nights_at_hotel`.
+            acceptable (dict, optional): Other room types each guest accepts, by guest id.
+            book (bool): If True, the assigned rooms are booked.
+
+        Returns:
+            dict: As `allocate`, with the requests in the order of `guests`.
+        """
+        return self.allocate([guest.nights_at_hotel for guest in guests], [guest.room_type for guest in guests],
+                             [acceptable.get(guest.id) for guest in guests] if acceptable else None, book)
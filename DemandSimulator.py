@@ -0,0 +1,220 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+from Hotel_pkg.PricePercentage import get_pricing_model, OCCUPANCY_BANDS
+from Hotel_pkg.hotel_env import ROOM_TYPES
+from Hotel_pkg.Payroll import Payroll
+from Hotel_pkg.ProfitOptimizer import DemandModel, ProfitOptimizer
+
+# Probability of a stay of 1, 2, ... nights
+STAY_PROBABILITIES = (0.22, 0.2, 0.16, 0.12, 0.1, 0.08, 0.12)
+
+
+def _run_batch(simulator, seeds):
+    """
+    Runs the replicas of a batch in a worker process.
+    """
+    return [simulator.run_replica(seed) for seed in seeds]
+
+
+class DemandSimulator:
+    """
+    Monte Carlo simulator of a year of guest arrivals across the chain.
+
+    Every day, each hotel receives Poisson arrivals per room type, with rates set by the
+    season and location (`DemandModel`), the room-type preferences and the price policy.
+    Guests take a free room of their type or are turned away, and stay a random number
+    of nights. Rooms are priced like `Ht_distribution.room_pricing` builds hotels: the
+    `PricePercentage` price of the season, switched by occupancy band as `Hotel` does,
+    and locked at check-in for the whole stay. Payroll is the `EmployeeSalary` cost of
+    the default staff plus housekeeping per occupied room-night (see `ProfitOptimizer`).
+
+    A replica advances all hotels and room types together, one vectorized step per day,
+    on room counts rather than `Hotel` objects. Replicas are independent and seeded from
+    a `SeedSequence`, so results depend only on the seed, not on how replicas are spread
+    across processes.
+    """
+
+    def __init__(self, hotels, demand=None, multipliers=None, type_preferences=None,
+                 stay_probabilities=STAY_PROBABILITIES, bands=OCCUPANCY_BANDS, payroll=None):
+        """
+        Prepares the chain's inventory, prices, demand and payroll arrays.
+
+        Args:
+            hotels (list): `Ht_distribution` objects of the chain.
+            demand (DemandModel, optional): Demand model. Defaults to `DemandModel()`.
+            multipliers (array-like, optional): Price policy, a multiplier over the fuzzy price per
+                                                hotel and room type, shape (H, T). Defaults to 1.
+            type_preferences (array-like, optional): Share of arrivals wanting each room type.
+                                                     Defaults to each hotel's share of rooms.
+            stay_probabilities (tuple): Probability of a stay of 1, 2, ... nights.
+            bands (tuple): Occupancy band boundaries for pricing. Empty disables occupancy pricing.
+            payroll (Payroll, optional): Payroll engine. Defaults to one on the shared salary model.
+        """
+        self.hotels = list(hotels)
+        self.demand = demand if demand is not None else DemandModel()
+        payroll = payroll if payroll is not None else Payroll()
+        hotels_count, types = len(self.hotels), len(ROOM_TYPES)
+
+        stars = np.array([h.stars for h in self.hotels], dtype=np.int64)
+        locations = np.array([h.location for h in self.hotels], dtype=np.int64)
+        configs = [h.room_config() for h in self.hotels]
+        # Reshaped so an empty chain still has one column per room type
+        self.rooms = np.array([quantities for quantities, _ in configs], dtype=np.int64).reshape(-1, types)
+        base_prices = np.array([prices for _, prices in configs], dtype=np.float64).reshape(-1, types)
+        self.multipliers = np.ones((hotels_count, types)) if multipliers is None else \
+            np.broadcast_to(np.asarray(multipliers, dtype=np.float64), (hotels_count, types))
+
+        # Day-by-day season calendar: the seasons in order, each lasting its number of days
+        seasons = np.arange(len(self.demand.season_days))
+        self.calendar = np.repeat(seasons, self.demand.season_days.astype(np.int64))
+
+        # Band prices per hotel, type, season and band in one batched call, shape (H, T, S, B),
+        # and the booked-room counts at which each band starts, shape (H, T, B - 1)
+        occupancies = np.array((0.0,) + tuple(bands))
+        self.band_prices = self.multipliers[:, :, None, None] * get_pricing_model().calculated_prices(
+            seasons[None, None, :, None], np.arange(types)[None, :, None, None],
+            locations[:, None, None, None], base_prices[:, :, None, None], occupancies[None, None, None, :])
+        self.band_limits = np.ceil(np.asarray(bands, dtype=np.float64) * self.rooms[:, :, None] - 1e-9)
+
+        # Daily arrival rate per hotel, type and season, shape (H, T, S)
+        self.stay_probabilities = np.asarray(stay_probabilities, dtype=np.float64)
+        mean_stay = (np.arange(1, len(self.stay_probabilities) + 1) * self.stay_probabilities).sum()
+        total_rooms = self.rooms.sum(axis=1)
+        if type_preferences is None:
+            preferences = self.rooms / total_rooms[:, None]
+        else:
+            preferences = np.broadcast_to(np.asarray(type_preferences, dtype=np.float64), (hotels_count, types))
+            preferences = preferences / preferences.sum(axis=1, keepdims=True)
+        base_occupancy = self.demand.base_occupancy(locations, seasons)
+        self.arrival_rates = (total_rooms[:, None, None] * preferences[:, :, None] * base_occupancy[:, None, :]
+                              * self.multipliers[:, :, None] ** -self.demand.elasticity / mean_stay)
+
+        self.fixed_payroll, self.room_night_cost = ProfitOptimizer.staff_costs(stars, total_rooms, payroll)
+
+    def run_replica(self, seed):
+        """
+        Simulates one year of the chain.
+
+        Args:
+            seed (numpy.random.SeedSequence or int): Seed of the replica.
+
+        Returns:
+            dict: Per-hotel "revenue", "payroll" and "occupancy" (H,), and per-hotel, per-type
+                  "room_nights", "requests" and "turned_away" (H, T).
+        """
+        rng = np.random.default_rng(seed)
+        hotels_count, types = self.rooms.shape
+        max_stay = len(self.stay_probabilities)
+        hotel_index = np.arange(hotels_count)[:, None]
+        type_index = np.arange(types)[None, :]
+
+        in_house = np.zeros((hotels_count, types), dtype=np.int64)
+        # Ring buffer of check-outs per day ahead, indexed by day % (max_stay + 1)
+        checkouts = np.zeros((max_stay + 1, hotels_count, types), dtype=np.int64)
+        nights = np.arange(1, max_stay + 1)
+        revenue = np.zeros(hotels_count)
+        room_nights = np.zeros((hotels_count, types), dtype=np.int64)
+        requests_total = np.zeros((hotels_count, types), dtype=np.int64)
+        turned_away = np.zeros((hotels_count, types), dtype=np.int64)
+
+        for day, season in enumerate(self.calendar):
+            slot = day % (max_stay + 1)
+            in_house -= checkouts[slot]
+            checkouts[slot] = 0
+
+            # Price of the band each type is in at the start of the day
+            band = (in_house[:, :, None] >= self.band_limits).sum(axis=2)
+            prices = self.band_prices[hotel_index, type_index, season, band]
+
+            requests = rng.poisson(self.arrival_rates[:, :, season])
+            accepted = np.minimum(requests, self.rooms - in_house)
+
+            # Stay length of every accepted guest, counted per length, hotel and type: (max_stay, H, T)
+            cells = np.repeat(np.arange(accepted.size), accepted.ravel())
+            lengths = rng.choice(max_stay, size=len(cells), p=self.stay_probabilities)
+            stays = np.bincount(lengths * accepted.size + cells,
+                                minlength=max_stay * accepted.size).reshape(max_stay, *accepted.shape)
+
+            revenue += (prices * np.tensordot(nights, stays, axes=1)).sum(axis=1)
+            in_house += accepted
+            checkouts[(day + nights) % (max_stay + 1)] += stays
+            room_nights += in_house
+            requests_total += requests
+            turned_away += requests - accepted
+
+        occupied = room_nights.sum(axis=1)
+        return {
+            "revenue": revenue,
+            "payroll": self.fixed_payroll + occupied * self.room_night_cost,
+            "occupancy": occupied / (self.rooms.sum(axis=1) * len(self.calendar)),
+            "room_nights": room_nights,
+            "requests": requests_total,
+            "turned_away": turned_away,
+        }
+
+    def run(self, replicas=1000, seed=None, processes=None, batch_size=None):
+        """
+        Runs independent replicas, spread across a process pool.
+
+        Replica i always uses the i-th child of `SeedSequence(seed)`, so results are
+        reproducible for a given seed whatever the number of processes.
+
+        Args:
+            replicas (int): Number of replicas.
+            seed (int, optional): Seed for reproducible results.
+            processes (int, optional): Worker processes. Defaults to the CPU count; 1 runs inline.
+            batch_size (int, optional): Replicas per task. Defaults to spreading them evenly, about
+                                        four tasks per process.
+
+        Returns:
+            dict: Per-replica, per-hotel "revenue", "payroll", "profit" and "occupancy" (R, H), and
+                  per-replica chain totals "chain_revenue", "chain_payroll", "chain_profit" and
+                  "chain_occupancy" (R,).
+        """
+        seeds = np.random.SeedSequence(seed).spawn(replicas)
+        processes = processes if processes is not None else os.cpu_count() or 1
+        if processes == 1 or replicas == 1:
+            results = [self.run_replica(s) for s in seeds]
+        else:
+            batch_size = batch_size or max(1, -(-replicas // (processes * 4)))
+            batches = [seeds[i:i + batch_size] for i in range(0, replicas, batch_size)]
+            with ProcessPoolExecutor(max_workers=min(processes, len(batches))) as pool:
+                results = [result for batch in pool.map(partial(_run_batch, self), batches) for result in batch]
+
+        revenue = np.array([r["revenue"] for r in results])
+        payroll = np.array([r["payroll"] for r in results])
+        occupancy = np.array([r["occupancy"] for r in results])
+        room_capacity = self.rooms.sum(axis=1) * len(self.calendar)
+        return {
+            "revenue": revenue,
+            "payroll": payroll,
+            "profit": revenue - payroll,
+            "occupancy": occupancy,
+            "chain_revenue": revenue.sum(axis=1),
+            "chain_payroll": payroll.sum(axis=1),
+            "chain_profit": (revenue - payroll).sum(axis=1),
+            "chain_occupancy": (occupancy * room_capacity).sum(axis=1) / max(room_capacity.sum(), 1),
+        }
+
+    @staticmethod
+    def summary(results, percentiles=(5, 50, 95)):
+        """
+        Summarizes the chain-level distributions of a `run`.
+
+        Args:
+            results (dict): Output of `run`.
+            percentiles (tuple): Percentiles to report.
+
+        Returns:
+            dict: {"revenue", "payroll", "profit", "occupancy"}, each with "mean", "std"
+                  and one "p<q>" entry per percentile.
+        """
+        summary = {}
+        for name in ("revenue", "payroll", "profit", "occupancy"):
+            values = results[f"chain_{name}"]
+            stats = {"mean": float(values.mean()), "std": float(values.std())}
+            stats.update({f"p{q}": float(v) for q, v in zip(percentiles, np.percentile(values, percentiles))})
+            summary[name] = stats
+        return summary
@@ -1,4 +1,6 @@
-from EmployeeSalary import EmployeeSalary
+import math
+from Hotel_pkg.Payroll import get_salary_model
+from Hotel_pkg.Instrumentation import instrumentation
 
 class Employee:
     """
@@ -21,21 +23,46 @@ class Employee:
         self.salary = salary
         self.job_position = job_position
         
-    def monthly_salary(self):
+    def monthly_salary(self, update=True):
         """
         Calculates the employee's monthly salary adjusted by the fuzzy multiplier.
 
-        Uses the EmployeeSalary class to determine the multiplier based on:
+        Uses the shared compiled EmployeeSalary model to determine the multiplier based on:
         - Job position level.
         - Hotel's star rating.
 
-        Updates the employee's salary with the calculated value.
+        The multiplier is applied to `self.salary`. By default the result is stored
+        back in `self.salary`, as it always was, so repeated calls compound the
+        multiplier; with `update=False` the employee is left untouched and repeated
+        calls give the same result.
+
+        Args:
+            update (bool): If True, stores the result in `self.salary`.
 
         Returns:
-            None. Updates the `self.salary` attribute directly.
+            float: The calculated monthly salary.
+
+        Raises:
+            ValueError: If no salary rule covers the employee's job position and hotel rating.
         """
-        multiplier = EmployeeSalary()
-        
-        final_salary = multiplier.salary_calculator(self.job_position, self.hotel_rating, self.salary)
-        
-        self.salary = round(final_salary, 2)
+        final_salary = get_salary_model().salary_calculator(self.job_position, self.hotel_rating, self.salary)
+        if math.isnan(final_salary):
+            raise ValueError(f"No salary rule covers employee {self.id} "
+                             f"(job_position={self.job_position}, hotel_rating={self.hotel_rating})")
+        final_salary = round(final_salary, 2)
+
+        if update:
+            self.salary = final_salary
+        if instrumentation.active:
+            instrumentation.emit("salary", employee=self.id, job_position=self.job_position,
+                                 hotel_rating=self.hotel_rating, salary=final_salary)
+        return final_salary
+
+    def calculated_salary(self):
+        """
+        Calculates the monthly salary without modifying the employee.
+
+        Returns:
+            float: The calculated monthly salary.
+        """
+        return self.monthly_salary(update=False)
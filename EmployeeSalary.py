@@ -1,6 +1,44 @@
 import numpy as np
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
+from Hotel_pkg.FuzzyEngine import build_skfuzzy, load_engine
+from Hotel_pkg.Instrumentation import instrumentation
+
+# Modelo salarial difuso como datos simples, compartido por la simulación de skfuzzy
+# y el motor compilado. Su hash identifica el artefacto compilado.
+SALARY_MODEL = {
+    "inputs": [
+        ("job_position", (1, 6, 1), {"junior": ("trimf", (1, 1, 2)),
+                                     "mid": ("trimf", (2, 3, 4)),
+                                     "senior": ("trimf", (3, 4, 5)),
+                                     "executive": ("trimf", (4, 5, 5))}),
+        ("hotel_rating", (3, 6, 1), {"three": ("trimf", (3, 3, 4)),
+                                     "four": ("trimf", (3, 4, 5)),
+                                     "five": ("trimf", (4, 5, 5))}),
+    ],
+    "output": ("salary_multiplier", (0.8, 2.1, 0.1), {"very_low": ("trimf", (0.8, 0.8, 1.0)),
+                                                      "low": ("trimf", (0.9, 1.0, 1.2)),
+                                                      "medium": ("trimf", (1.1, 1.3, 1.5)),
+                                                      "high": ("trimf", (1.4, 1.6, 1.8)),
+                                                      "very_high": ("trimf", (1.7, 2.0, 2.0))}),
+    # (job_position, hotel_rating) -> salary_multiplier
+    "rules": [({"job_position": position, "hotel_rating": rating}, multiplier)
+              for position, rating, multiplier in [
+                  ("junior", "three", "very_low"),
+                  ("junior", "four", "low"),
+                  ("junior", "five", "medium"),
+
+                  ("mid", "three", "low"),
+                  ("mid", "four", "medium"),
+                  ("mid", "five", "high"),
+
+                  ("senior", "three", "medium"),
+                  ("senior", "four", "high"),
+                  ("senior", "five", "very_high"),
+
+                  ("executive", "three", "high"),
+                  ("executive", "four", "very_high"),
+                  ("executive", "five", "very_high"),
+              ]],
+}
 
 class EmployeeSalary:
     """
@@ -8,51 +46,32 @@ class EmployeeSalary:
     basado en el puesto de trabajo y la calificación del hotel.
     """
     
-    def __init__(self):
+    def __init__(self, compiled=False):
         """
-        Inicializa las variables difusas y define las reglas de decisión.
+        Inicializa las variables difusas y las reglas de decisión a partir de `SALARY_MODEL`.
+
+        Args:
+            compiled (bool): Si es True, los cálculos usan el `MamdaniEngine` compilado, cargado
+                             de su artefacto en disco; no se importa skfuzzy ni se construyen
+                             sus variables, reglas y simulación.
         """
-        self.job_position = ctrl.Antecedent(np.arange(1, 6, 1), 'job_position')
-        self.hotel_rating = ctrl.Antecedent(np.arange(3, 6, 1), 'hotel_rating')
-
-        self.salary_multiplier = ctrl.Consequent(np.arange(0.8, 2.1, 0.1), 'salary_multiplier')
-
-        self.job_position['junior'] = fuzz.trimf(self.job_position.universe, [1, 1, 2])
-        self.job_position['mid'] = fuzz.trimf(self.job_position.universe, [2, 3, 4])
-        self.job_position['senior'] = fuzz.trimf(self.job_position.universe, [3, 4, 5])
-        self.job_position['executive'] = fuzz.trimf(self.job_position.universe, [4, 5, 5])
-
-        self.hotel_rating['three'] = fuzz.trimf(self.hotel_rating.universe, [3, 3, 4])
-        self.hotel_rating['four'] = fuzz.trimf(self.hotel_rating.universe, [3, 4, 5])
-        self.hotel_rating['five'] = fuzz.trimf(self.hotel_rating.universe, [4, 5, 5])
-
-        self.salary_multiplier['very_low'] = fuzz.trimf(self.salary_multiplier.universe, [0.8, 0.8, 1.0])
-        self.salary_multiplier['low'] = fuzz.trimf(self.salary_multiplier.universe, [0.9, 1.0, 1.2])
-        self.salary_multiplier['medium'] = fuzz.trimf(self.salary_multiplier.universe, [1.1, 1.3, 1.5])
-        self.salary_multiplier['high'] = fuzz.trimf(self.salary_multiplier.universe, [1.4, 1.6, 1.8])
-        self.salary_multiplier['very_high'] = fuzz.trimf(self.salary_multiplier.universe, [1.7, 2.0, 2.0])
-
-        # Creación de reglas difusas
-        self.rules = [
-            ctrl.Rule(self.job_position['junior'] & self.hotel_rating['three'], self.salary_multiplier['very_low']),
-            ctrl.Rule(self.job_position['junior'] & self.hotel_rating['four'], self.salary_multiplier['low']),
-            ctrl.Rule(self.job_position['junior'] & self.hotel_rating['five'], self.salary_multiplier['medium']),
-            
-            ctrl.Rule(self.job_position['mid'] & self.hotel_rating['three'], self.salary_multiplier['low']),
-            ctrl.Rule(self.job_position['mid'] & self.hotel_rating['four'], self.salary_multiplier['medium']),
-            ctrl.Rule(self.job_position['mid'] & self.hotel_rating['five'], self.salary_multiplier['high']),
-            
-            ctrl.Rule(self.job_position['senior'] & self.hotel_rating['three'], self.salary_multiplier['medium']),
-            ctrl.Rule(self.job_position['senior'] & self.hotel_rating['four'], self.salary_multiplier['high']),
-            ctrl.Rule(self.job_position['senior'] & self.hotel_rating['five'], self.salary_multiplier['very_high']),
-            
-            ctrl.Rule(self.job_position['executive'] & self.hotel_rating['three'], self.salary_multiplier['high']),
-            ctrl.Rule(self.job_position['executive'] & self.hotel_rating['four'], self.salary_multiplier['very_high']),
-            ctrl.Rule(self.job_position['executive'] & self.hotel_rating['five'], self.salary_multiplier['very_high']),
-        ]
-
-        self.salary_ctrl = ctrl.ControlSystem(self.rules)
-        self.salary_simulation = ctrl.ControlSystemSimulation(self.salary_ctrl)
+        self.compiled = compiled
+        if compiled:
+            self.job_position = self.hotel_rating = self.salary_multiplier = None
+            self.rules = None
+            self.salary_ctrl = None
+            self.salary_simulation = None
+        else:
+            from skfuzzy import control as ctrl
+
+            antecedents, self.salary_multiplier, self.rules = build_skfuzzy(SALARY_MODEL)
+            self.job_position = antecedents['job_position']
+            self.hotel_rating = antecedents['hotel_rating']
+            self.salary_ctrl = ctrl.ControlSystem(self.rules)
+            self.salary_simulation = ctrl.ControlSystemSimulation(self.salary_ctrl)
+
+        # Motor compilado para los cálculos por lotes, se carga al primer uso
+        self._engine = self._compile_engine() if compiled else None
 
     def salary_calculator(self, job_position, stars, base_salary):
         """
@@ -66,11 +85,58 @@ class EmployeeSalary:
         Returns:
             float: Salario final calculado.
         """
-        
-        self.salary_simulation.input['job_position'] = job_position
-        self.salary_simulation.input['hotel_rating'] = stars
+        start = instrumentation.start() if instrumentation.active else 0
+        if self.compiled:
+            salary = base_salary * self._engine.compute(job_position, stars)[()]
+        else:
+            self.salary_simulation.input['job_position'] = job_position
+            self.salary_simulation.input['hotel_rating'] = stars
 
-        self.salary_simulation.compute()
+            self.salary_simulation.compute()
 
-        salary = base_salary * self.salary_simulation.output['salary_multiplier']
+            salary = base_salary * self.salary_simulation.output['salary_multiplier']
+        if start:
+            instrumentation.finish("salary", start)
         return salary
+
+    def salary_multipliers(self, job_positions, stars):
+        """
+        Calcula los multiplicadores salariales de muchos empleados en una sola pasada.
+
+        Usa el `MamdaniEngine` compilado; los resultados son idénticos a los de la
+        simulación de skfuzzy.
+
+        Args:
+            job_positions (array-like): Niveles de puesto de trabajo (1-5).
+            stars (array-like): Clasificaciones de los hoteles (3-5 estrellas).
+
+        Returns:
+            numpy.ndarray: Multiplicadores con la forma combinada de las entradas.
+        """
+        if self._engine is None:
+            self._engine = self._compile_engine()
+        return self._engine.compute(job_positions, stars)
+
+    def salary_calculations(self, job_positions, stars, base_salaries):
+        """
+        Calcula los salarios finales de muchos empleados en una sola pasada.
+
+        Args:
+            job_positions (array-like): Niveles de puesto de trabajo (1-5).
+            stars (array-like): Clasificaciones de los hoteles (3-5 estrellas).
+            base_salaries (array-like): Salarios base de los empleados.
+
+        Returns:
+            numpy.ndarray: Salarios finales calculados.
+        """
+        start = instrumentation.start() if instrumentation.active else 0
+        salaries = np.asarray(base_salaries, dtype=np.float64) * self.salary_multipliers(job_positions, stars)
+        if start:
+            instrumentation.finish("salary", start)
+        return salaries
+
+    def _compile_engine(self):
+        """
+        Carga el `MamdaniEngine` compilado de `SALARY_MODEL`, construyendo su artefacto si falta o está obsoleto.
+        """
+        return load_engine(SALARY_MODEL, "salary")
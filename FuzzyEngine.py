@@ -0,0 +1,495 @@
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from functools import reduce
+import numpy as np
+from Hotel_pkg.Instrumentation import instrumentation
+
+# Bump when the artifact layout or the engine's arrays change, so old artifacts are rebuilt
+ARTIFACT_VERSION = 1
+# Directory for compiled artifacts, overridable with the HOTEL_FUZZY_ARTIFACTS environment variable
+ARTIFACT_DIR = os.environ.get("HOTEL_FUZZY_ARTIFACTS",
+                              os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts"))
+
+
+def trimf(x, abc):
+    """
+    Triangular membership function, computed exactly like `skfuzzy.trimf`.
+
+    Args:
+        x (numpy.ndarray): Universe of the variable.
+        abc (sequence): Feet and peak (a <= b <= c) of the triangle.
+
+    Returns:
+        numpy.ndarray: Membership degree of every point of `x`.
+    """
+    a, b, c = abc
+    y = np.zeros(len(x))
+    if a != b:
+        idx = np.nonzero(np.logical_and(a < x, x < b))[0]
+        y[idx] = (x[idx] - a) / float(b - a)
+    if b != c:
+        idx = np.nonzero(np.logical_and(b < x, x < c))[0]
+        y[idx] = (c - x[idx]) / float(c - b)
+    y[np.nonzero(x == b)] = 1
+    return y
+
+
+def trapmf(x, abcd):
+    """
+    Trapezoidal membership function, computed exactly like `skfuzzy.trapmf`.
+
+    Args:
+        x (numpy.ndarray): Universe of the variable.
+        abcd (sequence): Feet and shoulders (a <= b <= c <= d) of the trapezoid.
+
+    Returns:
+        numpy.ndarray: Membership degree of every point of `x`.
+    """
+    a, b, c, d = abcd
+    y = np.ones(len(x))
+    idx = np.nonzero(x <= b)[0]
+    y[idx] = trimf(x[idx], (a, b, b))
+    idx = np.nonzero(x >= c)[0]
+    y[idx] = trimf(x[idx], (c, c, d))
+    y[np.nonzero(x < a)[0]] = 0
+    y[np.nonzero(x > d)[0]] = 0
+    return y
+
+
+# Membership function shapes a model definition can use
+MEMBERSHIP_FUNCTIONS = {"trimf": trimf, "trapmf": trapmf}
+
+
+def _variable(definition):
+    """
+    Samples the universe and membership functions of a variable definition.
+    """
+    label, universe, terms = definition
+    universe = np.arange(*universe)
+    return label, universe, {term: MEMBERSHIP_FUNCTIONS[shape](universe, params)
+                             for term, (shape, params) in terms.items()}
+
+
+def model_digest(model):
+    """
+    Hashes a model definition together with the artifact version.
+
+    Args:
+        model (dict): Model definition (see `MamdaniEngine.from_model`).
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    payload = json.dumps({"version": ARTIFACT_VERSION, "model": model}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def build_skfuzzy(model):
+    """
+    Builds the skfuzzy variables and rules of a model definition.
+
+    skfuzzy is only imported here, so code that runs on compiled engines never loads it.
+
+    Args:
+        model (dict): Model definition (see `MamdaniEngine.from_model`).
+
+    Returns:
+        tuple: ({label: Antecedent}, Consequent, [Rule]), antecedents in input order.
+    """
+    import skfuzzy as fuzz
+    from skfuzzy import control as ctrl
+
+    def _fill(var, terms):
+        for term, (shape, params) in terms.items():
+            var[term] = getattr(fuzz, shape)(var.universe, list(params))
+        return var
+
+    antecedents = {label: _fill(ctrl.Antecedent(np.arange(*universe), label), terms)
+                   for label, universe, terms in model["inputs"]}
+    label, universe, terms = model["output"]
+    consequent = _fill(ctrl.Consequent(np.arange(*universe), label), terms)
+    rules = [ctrl.Rule(reduce(lambda left, right: left & right,
+                              (antecedents[label][term] for label, term in antecedent.items())),
+                       consequent[output_term])
+             for antecedent, output_term in model["rules"]]
+    return antecedents, consequent, rules
+
+
+def _artifact_version(entry, name):
+    """
+    Returns the artifact version encoded in a file name of `load_engine`, or None if it is not one.
+    """
+    prefix = f"{name}-v"
+    if not (entry.startswith(prefix) and entry.endswith(".npz")):
+        return None
+    version = entry[len(prefix):].split("-", 1)[0]
+    return int(version) if version.isdigit() else None
+
+
+def load_engine(model, name, directory=None):
+    """
+    Loads the compiled engine of a model from its artifact, building and caching it if needed.
+
+    Artifacts are named after the model, `ARTIFACT_VERSION` and the digest of its definition,
+    so editing a rule or membership function makes the code look for another artifact and
+    build it. Artifacts of other definitions are kept, as other code versions may use them;
+    those of older artifact versions are removed.
+    If the artifact cannot be written (e.g. read-only install), the engine is still returned.
+
+    Args:
+        model (dict): Model definition (see `MamdaniEngine.from_model`).
+        name (str): Artifact name, e.g. "pricing".
+        directory (str, optional): Artifact directory. Defaults to `ARTIFACT_DIR`.
+
+    Returns:
+        MamdaniEngine: The compiled engine.
+    """
+    directory = directory or ARTIFACT_DIR
+    digest = model_digest(model)
+    path = os.path.join(directory, f"{name}-v{ARTIFACT_VERSION}-{digest[:16]}.npz")
+    try:
+        return MamdaniEngine.load(path, digest)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        pass  # Missing, stale or corrupt artifact
+
+    engine = MamdaniEngine.from_model(model)
+    try:
+        engine.save(path, digest)
+        # Only artifacts of older layouts are removed: other definitions of the same version may
+        # belong to another code version sharing the directory (e.g. during a rolling deploy)
+        for entry in os.listdir(directory):
+            version = _artifact_version(entry, name)
+            if version is not None and version < ARTIFACT_VERSION:
+                os.remove(os.path.join(directory, entry))
+    except OSError:
+        pass
+    return engine
+
+
+class MamdaniEngine:
+    """
+    Compiled Mamdani inference engine for rule bases made of AND rules.
+
+    The fuzzy variables and rules are compiled once into dense NumPy arrays:
+    - a membership matrix with every input term sampled on its universe,
+    - a rule-activation matrix pointing each rule at one membership column per input,
+    - the output terms, defuzzified with the centroid method.
+
+    Evaluation follows skfuzzy's ControlSystemSimulation (min for AND, max accumulation,
+    centroid over the universe upsampled at the cut points) step by step, so results are
+    identical to it while whole batches of continuous inputs are evaluated at once.
+    """
+
+    # Below this many samples, deduplicating the inputs costs more than it saves
+    DEDUP_THRESHOLD = 64
+
+    def __init__(self, inputs, output, rules):
+        """
+        Compiles the variable and rule definitions into arrays.
+
+        Args:
+            inputs (list): One (label, universe, {term: membership}) tuple per input variable,
+                           in the order the values are passed to `compute`.
+            output (tuple): (label, universe, {term: membership}) for the output variable.
+            rules (list): (antecedent, consequent) pairs, where antecedent is a dict
+                          {input label: term label} combined with AND, and consequent
+                          is an output term label.
+        """
+        self.labels = [label for label, _, _ in inputs]
+        self.output_label = output[0]
+
+        # Membership matrix: one row per input term, plus a constant row for inputs a rule ignores
+        self.universes = []
+        self.term_columns = []
+        rows = []
+        for label, universe, terms in inputs:
+            universe = np.asarray(universe, dtype=np.float64)
+            self.universes.append(universe)
+            self.term_columns.append({term: len(rows) + i for i, term in enumerate(terms)})
+            rows.extend(np.asarray(mf, dtype=np.float64) for mf in terms.values())
+        self.memberships = rows
+        self.always = len(rows)
+
+        # Rule-activation matrix: the membership column each rule reads for every input
+        output_terms = list(output[2])
+        self.rule_matrix = np.full((len(rules), len(inputs)), self.always, dtype=np.intp)
+        rule_outputs = np.zeros(len(rules), dtype=np.intp)
+        for r, (antecedent, consequent) in enumerate(rules):
+            for label, term in antecedent.items():
+                column = self.labels.index(label)
+                self.rule_matrix[r, column] = self.term_columns[column][term]
+            rule_outputs[r] = output_terms.index(consequent)
+
+        # Output terms that no rule points to are left out, as skfuzzy does
+        used = np.unique(rule_outputs)
+        self.rule_order = np.argsort(rule_outputs, kind='stable')
+        self.rule_starts = np.searchsorted(rule_outputs[self.rule_order], used)
+        self.output_universe = np.asarray(output[1], dtype=np.float64)
+        self.output_mfs = np.array([output[2][output_terms[k]] for k in used], dtype=np.float64)
+
+    @classmethod
+    def from_skfuzzy(cls, antecedents, consequent, rules):
+        """
+        Compiles skfuzzy Antecedent, Consequent and Rule objects.
+
+        Args:
+            antecedents (list): skfuzzy Antecedents, in the order values are passed to `compute`.
+            consequent (Consequent): skfuzzy Consequent.
+            rules (list): skfuzzy Rules whose antecedents only use AND.
+
+        Returns:
+            MamdaniEngine: The compiled engine.
+
+        Raises:
+            ValueError: If a rule uses OR or NOT, or has more than one consequent.
+        """
+        def _and_terms(clause):
+            if hasattr(clause, 'kind'):
+                if clause.kind != 'and':
+                    raise ValueError(f"Only AND rules can be compiled, found {clause.kind.upper()}")
+                return _and_terms(clause.term1) + _and_terms(clause.term2)
+            return [clause]
+
+        def _definition(var):
+            return var.label, var.universe, {label: term.mf for label, term in var.terms.items()}
+
+        compiled_rules = []
+        for rule in rules:
+            if len(rule.consequent) != 1:
+                raise ValueError("Only rules with a single consequent can be compiled")
+            antecedent = {term.parent.label: term.label for term in _and_terms(rule.antecedent)}
+            compiled_rules.append((antecedent, rule.consequent[0].term.label))
+
+        return cls([_definition(var) for var in antecedents], _definition(consequent), compiled_rules)
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Compiles a plain-data model definition, without skfuzzy.
+
+        A model is a dict with:
+        - "inputs": (label, (start, stop, step), {term: (shape, params)}) per input variable,
+          in the order values are passed to `compute`; the universe is np.arange(start, stop, step)
+          and shape names a function of `MEMBERSHIP_FUNCTIONS`,
+        - "output": the same tuple for the output variable,
+        - "rules": ({input label: term}, output term) pairs, combined with AND.
+
+        Args:
+            model (dict): Model definition.
+
+        Returns:
+            MamdaniEngine: The compiled engine, identical to compiling the skfuzzy objects.
+        """
+        return cls([_variable(definition) for definition in model["inputs"]],
+                   _variable(model["output"]),
+                   [(dict(antecedent), consequent) for antecedent, consequent in model["rules"]])
+
+    def save(self, path, digest=""):
+        """
+        Writes the compiled arrays to an uncompressed .npz artifact.
+
+        The file is written to a temporary name and renamed, so concurrent workers
+        never read a partial artifact.
+
+        Args:
+            path (str): Destination .npz file.
+            digest (str): Digest of the model definition, checked by `load`.
+        """
+        arrays = {
+            "version": np.array(ARTIFACT_VERSION),
+            "digest": np.array(digest),
+            "labels": np.array(self.labels),
+            "output_label": np.array(self.output_label),
+            "rule_matrix": self.rule_matrix,
+            "rule_order": self.rule_order,
+            "rule_starts": self.rule_starts,
+            "output_universe": self.output_universe,
+            "output_mfs": self.output_mfs,
+        }
+        for i, (universe, terms) in enumerate(zip(self.universes, self.term_columns)):
+            arrays[f"universe_{i}"] = universe
+            arrays[f"terms_{i}"] = np.array(list(terms))
+            arrays[f"memberships_{i}"] = np.array([self.memberships[index] for index in terms.values()])
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(suffix=".npz", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    @classmethod
+    def load(cls, path, digest=None):
+        """
+        Reads an engine written by `save`.
+
+        Args:
+            path (str): .npz artifact.
+            digest (str, optional): Expected digest of the model definition.
+
+        Returns:
+            MamdaniEngine: The engine.
+
+        Raises:
+            ValueError: If the artifact has another version or digest.
+        """
+        with np.load(path, allow_pickle=False) as arrays:
+            if int(arrays["version"]) != ARTIFACT_VERSION:
+                raise ValueError(f"{path} has artifact version {int(arrays['version'])}")
+            if digest is not None and str(arrays["digest"]) != digest:
+                raise ValueError(f"{path} was built from another model definition")
+
+            engine = cls.__new__(cls)
+            engine.labels = arrays["labels"].tolist()
+            engine.output_label = str(arrays["output_label"])
+            engine.universes, engine.term_columns, engine.memberships = [], [], []
+            for i in range(len(engine.labels)):
+                terms = arrays[f"terms_{i}"].tolist()
+                engine.universes.append(arrays[f"universe_{i}"])
+                engine.term_columns.append({term: len(engine.memberships) + t for t, term in enumerate(terms)})
+                engine.memberships.extend(arrays[f"memberships_{i}"])
+            engine.always = len(engine.memberships)
+            engine.rule_matrix = arrays["rule_matrix"]
+            engine.rule_order = arrays["rule_order"]
+            engine.rule_starts = arrays["rule_starts"]
+            engine.output_universe = arrays["output_universe"]
+            engine.output_mfs = arrays["output_mfs"]
+        return engine
+
+    def compute(self, *values):
+        """
+        Evaluates the rule base for arrays of crisp inputs.
+
+        Inputs are clipped to their universes, as skfuzzy does by default.
+
+        Args:
+            *values (array-like): One value or array per input variable, broadcast together.
+
+        Returns:
+            numpy.ndarray: Defuzzified outputs with the broadcast shape of the inputs
+            (NaN where no rule fires).
+        """
+        if len(values) != len(self.universes):
+            raise ValueError(f"Expected {len(self.universes)} inputs, got {len(values)}")
+        inputs = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in values))
+        shape = inputs[0].shape
+        if inputs[0].size == 0:
+            return np.empty(shape)
+        start = instrumentation.start() if instrumentation.active else 0
+        columns = [v.ravel() for v in inputs]
+
+        # Repeated input tuples (e.g. integer seasons or ratings) are inferred only once
+        inverse = None
+        if inputs[0].size > self.DEDUP_THRESHOLD:
+            key = np.zeros(inputs[0].size, dtype=np.int64)
+            for column in columns:
+                levels, codes = np.unique(column, return_inverse=True)
+                # Re-rank after every column so the combined key never overflows
+                key = np.unique(key * len(levels) + codes.ravel(), return_inverse=True)[1].ravel()
+            _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+            columns = [column[first] for column in columns]
+
+        outputs = self.defuzzify(self.activate(self.fuzzify(columns)))
+        if inverse is not None:
+            outputs = outputs[inverse.ravel()]
+        if start:
+            instrumentation.finish("inference", start)
+        return outputs.reshape(shape)
+
+    def fuzzify(self, columns):
+        """
+        Builds the membership matrix for a batch of crisp inputs.
+
+        Args:
+            columns (list): One 1-d array of length N per input variable.
+
+        Returns:
+            numpy.ndarray: Membership degrees, shape (N, number of input terms + 1).
+        """
+        matrix = np.ones((len(columns[0]), self.always + 1))
+        for column, universe, terms in zip(columns, self.universes, self.term_columns):
+            values = np.clip(column, universe[0], universe[-1])
+            for index in terms.values():
+                matrix[:, index] = np.interp(values, universe, self.memberships[index], left=0.0, right=0.0)
+        return matrix
+
+    def activate(self, memberships):
+        """
+        Fires every rule and accumulates the firing strengths of each output term.
+
+        Args:
+            memberships (numpy.ndarray): Membership matrix from `fuzzify`.
+
+        Returns:
+            numpy.ndarray: Cut level of every used output term, shape (N, K).
+        """
+        firing = np.min(memberships[:, self.rule_matrix], axis=2)
+        return np.maximum.reduceat(firing[:, self.rule_order], self.rule_starts, axis=1)
+
+    def defuzzify(self, cuts):
+        """
+        Centroid of the clipped and aggregated output terms, one row per sample.
+
+        Like skfuzzy, the universe is upsampled with the points where each term crosses
+        its cut level, and the area under the piecewise-linear result is integrated exactly
+        with the same per-segment formulas and summation order, so results match it bit for bit.
+
+        Args:
+            cuts (numpy.ndarray): Cut level of every used output term, shape (N, K).
+
+        Returns:
+            numpy.ndarray: Crisp outputs of length N. Samples where no rule fires are NaN,
+            where skfuzzy would leave the output undefined.
+        """
+        if not len(cuts):
+            return np.empty(0)
+        universe, term_mfs = self.output_universe, self.output_mfs
+        x1, x2 = universe[:-1], universe[1:]
+        m1, m2 = term_mfs[:, :-1], term_mfs[:, 1:]
+        level = cuts[:, :, None]
+
+        # Segments where a term crosses its cut level; a zero cut only counts strictly positive values
+        above1 = np.where(level == 0.0, m1 > level, m1 >= level)
+        above2 = np.where(level == 0.0, m2 > level, m2 >= level)
+        crossing = above1 != above2
+        rise = np.where(m2 != m1, m2 - m1, 1.0)
+        extra = np.where(crossing, x1 + (level - m1) * (x2 - x1) / rise, x1)
+
+        # Non-crossing slots repeat a universe point, which adds a zero-width segment
+        samples = len(cuts)
+        xs = np.concatenate([np.broadcast_to(universe, (samples, len(universe))),
+                             extra.reshape(samples, -1)], axis=1)
+        xs.sort(axis=1)
+
+        ys = np.zeros_like(xs)
+        for k, mf in enumerate(term_mfs):
+            np.maximum(ys, np.fmin(cuts[:, k:k + 1], np.interp(xs, universe, mf, left=0.0, right=0.0)), out=ys)
+
+        # Rectangles, triangles and trapezoids between consecutive points
+        a, b = xs[:, :-1], xs[:, 1:]
+        y1, y2 = ys[:, :-1], ys[:, 1:]
+        width = b - a
+        with np.errstate(invalid='ignore', divide='ignore'):
+            moment = np.where(y1 == y2, 0.5 * (a + b),
+                     np.where(y1 == 0.0, 2.0 / 3.0 * width + a,
+                     np.where(y2 == 0.0, 1.0 / 3.0 * width + a,
+                              (2.0 / 3.0 * width * (y2 + 0.5 * y1)) / (y1 + y2) + a)))
+            area = np.where(y1 == y2, width * y1,
+                   np.where(y1 == 0.0, 0.5 * width * y2,
+                   np.where(y2 == 0.0, 0.5 * width * y1, 0.5 * width * (y1 + y2))))
+        empty = ((y1 == 0.0) & (y2 == 0.0)) | (width == 0.0)
+        moment_area = np.where(empty, 0.0, moment * area)
+        area = np.where(empty, 0.0, area)
+
+        # Sequential sums, in the same order as skfuzzy's loop
+        sum_moment_area = np.cumsum(moment_area, axis=1)[:, -1]
+        sum_area = np.cumsum(area, axis=1)[:, -1]
+        with np.errstate(invalid='ignore'):
+            return np.where(sum_area > 0.0, sum_moment_area / np.fmax(sum_area, np.finfo(float).eps), np.nan)
@@ -1,3 +1,4 @@
+from Hotel_pkg.Instrumentation import instrumentation
 
 class Guest:
     """
@@ -9,6 +10,9 @@ class Guest:
         nights_at_hotel (int): Number of nights the guest plans to stay.
         room_type (str): Type of room the guest wishes to book.
     """
+    # No per-instance __dict__: millions of guest records stay compact
+    __slots__ = ("id", "name", "nights_at_hotel", "room_type")
+
     def __init__(self, id, name, nights_at_hotel, room_type):
         """
         Initializes a Guest object with the provided attributes.
@@ -24,6 +28,15 @@ class Guest:
         self.nights_at_hotel = nights_at_hotel
         self.room_type = room_type
 
+    def as_dict(self):
+        """
+        Returns the guest's attributes as a dictionary.
+
+        Returns:
+            dict: {"id", "name", "nights_at_hotel", "room_type"} values of the guest.
+        """
+        return {attribute: getattr(self, attribute) for attribute in self.__slots__}
+
     def book_room(self, hotel):
         """
         Attempts to book a room at the hotel for the guest.
@@ -32,13 +45,35 @@ class Guest:
             hotel (Hotel): Hotel object that has the `get_room` method.
 
         Returns:
-            None. Prints a message indicating whether the booking was successful or not.
+            bool: True if the booking was successful. The outcome is also published
+            as a "guest_booking" or "guest_rejection" event.
         """
         room = hotel.get_room(self.room_type)  # Returns True if the room is available
-        if room:
-            print(f"You have successfully booked a {self.room_type} room")
-        else:
-            print(f"Room type: {self.room_type} is not available")
+        if instrumentation.active:
+            instrumentation.emit("guest_booking" if room else "guest_rejection",
+                                 guest=self.id, hotel=hotel.name, room_type=self.room_type)
+        return room
+
+    def book_stay(self, calendar, check_in):
+        """
+        Attempts to book a room for the guest's nights starting at a check-in date.
+
+        Only the calendar is updated; the room stays free in the hotel's own inventory
+        (see `ReservationCalendar`).
+
+        Args:
+            calendar (ReservationCalendar): Calendar of the hotel's rooms.
+            check_in (datetime.date or int): Check-in date, or night offset from the calendar start.
+
+        Returns:
+            int: Id of the booked room, or None if no room is free for the whole stay.
+        """
+        room_id = calendar.book(self.room_type, check_in, self.nights_at_hotel)
+        if instrumentation.active:
+            instrumentation.emit("guest_booking" if room_id is not None else "guest_rejection",
+                                 guest=self.id, room_type=self.room_type, nights=self.nights_at_hotel,
+                                 check_in=check_in, room_id=room_id)
+        return room_id
 
     def total_guest_price(self, rooms_config):
         """
@@ -57,8 +92,10 @@ class Guest:
                 price = round(room["price"] * self.nights_at_hotel, 2)
                 break
 
-        if price is not None:
-            print(f'Your total cost for {self.nights_at_hotel} nights is {price}')
-        else:
-            print(f"Error: Room type '{self.room_type}' is not available or invalid in configuration.")
+        if instrumentation.active:
+            if price is not None:
+                instrumentation.emit("quote", guest=self.id, room_type=self.room_type,
+                                     nights=self.nights_at_hotel, price=price)
+            else:
+                instrumentation.emit("quote_rejection", guest=self.id, room_type=self.room_type)
         return price
@@ -1,4 +1,14 @@
-from Hotel_pkg.PricePercentage import PricePercentage
+import math
+import threading
+from bisect import bisect_right
+from Hotel_pkg.PricePercentage import PricePercentage, OCCUPANCY_BANDS
+from Hotel_pkg.RoomStore import RoomStore
+from Hotel_pkg.Instrumentation import instrumentation
+
+# Operation codes passed to `Hotel.journal`
+JOURNAL_BOOK, JOURNAL_RELEASE, JOURNAL_REPRICE = 1, 2, 3
+# Season and occupancy band tables, written by `set_season` and `set_occupancy_pricing`
+JOURNAL_SEASON, JOURNAL_BANDS, JOURNAL_BAND_PRICE, JOURNAL_BAND_LIMIT = 4, 5, 6, 7
 
 class Hotel:
     """
@@ -18,20 +28,110 @@ class Hotel:
         """
         self.name = name
         self.stars = stars
-        self.rooms_config = []  # List to store details of all rooms
         self.location = location
         self.capacity = capacity
+        self.season = None          # Season the prices were set for, if known
+
+        self.rooms = RoomStore()    # Room type codes, prices, availability flags and free stacks
+        self.locks = {}             # Lock serializing releases, price changes and notifications per room type
+        self.watchers = []          # Callables notified as watcher(hotel, room_type) on every change
+        self.journal = None         # Callable journal(operation, room id or type code, price) recording every change
+
+        # Occupancy repricing, indexed by type code; empty until `set_occupancy_pricing` is called
+        self.type_sizes = []        # Number of rooms of each type
+        self.band_limits = []       # Booked-room counts at which each type enters its next occupancy band
+        self.band_prices = []       # Price per night of each occupancy band
+        self.bands = []             # Current occupancy band
 
         # Create room entries based on the provided configuration
         for room_type, (num, base_price) in rooms_config.items():
-            for _ in range(num):
-                room = {
-                    "room_type": room_type,     # Type of the room (e.g., double, deluxe, suite)
-                    "price": base_price,       # Base price of the room
-                    "available": True          # Availability status of the room
-                }
-                self.rooms_config.append(room)
-    
+            self.rooms.add_rooms(room_type, num, base_price)
+            self.locks[room_type] = threading.Lock()
+
+    @classmethod
+    def from_store(cls, name, stars, rooms, location, capacity):
+        """
+        Creates a hotel around an existing `RoomStore`, e.g. one restored from disk.
+
+        Args:
+            name (str): Name of the hotel.
+            stars (int): Star rating of the hotel.
+            rooms (RoomStore): Rooms of the hotel.
+            location (str): Location of the hotel.
+            capacity (int): Maximum capacity of the hotel (total number of guests).
+
+        Returns:
+            Hotel: The hotel.
+        """
+        hotel = cls(name, stars, {}, location, capacity)
+        hotel.rooms = rooms
+        hotel.locks = {room_type: threading.Lock() for room_type in rooms.type_names}
+        return hotel
+
+    @property
+    def rooms_config(self):
+        """
+        List of dictionaries describing every room, booked ones included.
+
+        Each dictionary contains `room_type`, `price` and `available`. It is built
+        on each access, so changes to it do not affect the hotel.
+        """
+        return list(self.rooms)
+
+    @property
+    def prices(self):
+        """
+        Current price per night of each room type, as a new dictionary.
+        """
+        return dict(zip(self.rooms.type_names, self.rooms.prices))
+
+    @property
+    def free_rooms(self):
+        """
+        Stack of free room ids of each room type.
+        """
+        return dict(zip(self.rooms.type_names, self.rooms.free))
+
+    @property
+    def room_types(self):
+        """
+        Room type of each room, indexed by room id, as a new list.
+        """
+        names = self.rooms.type_names
+        return [names[code] for code in self.rooms.codes]
+
+    @property
+    def available(self):
+        """
+        Availability flag of each room (1 if free), indexed by room id.
+        """
+        return self.rooms.available
+
+    def room_price(self, room_type):
+        """
+        Returns the current price per night of a room type.
+
+        Args:
+            room_type (str): Type of room.
+
+        Returns:
+            float: Price per night.
+        """
+        return self.rooms.prices[self.rooms.type_codes[room_type]]
+
+    def free_count(self, room_type):
+        """
+        Returns the number of free rooms of a type.
+
+        Args:
+            room_type (str): Type of room.
+
+        Returns:
+            int: Number of free rooms, 0 for unknown types.
+        """
+        code = self.rooms.type_codes.get(room_type)
+        return 0 if code is None else len(self.rooms.free[code])
+
     def price_setting(self, final_price, room_type):
         """
         Updates the price of all rooms of a specific type.
@@ -40,62 +140,302 @@ class Hotel:
             final_price (float): The new price for the room type.
             room_type (str): The type of room whose price will be updated.
         """
-        for room in self.rooms_config:
-            if room["room_type"] == room_type:
-                room["price"] = final_price
-                
+        code = self.rooms.type_codes.get(room_type)
+        if code is not None:
+            with self.locks[room_type]:
+                self.rooms.prices[code] = final_price
+                if self.journal is not None:
+                    self.journal(JOURNAL_REPRICE, code, final_price)
+                self._notify(room_type)
+            if instrumentation.active:
+                instrumentation.emit("repricing", hotel=self.name, room_type=room_type, price=final_price)
+
+    def set_occupancy_pricing(self, band_prices, bands=OCCUPANCY_BANDS):
+        """
+        Reprices room types as their occupancy (fraction of rooms booked) moves between bands.
+
+        The price of every band is given up front, so bookings and releases only compare
+        the booked-room count of the type against its band limits, and a type is repriced
+        only when it crosses into another band. A later `price_setting` overrides the price
+        until the next crossing.
+
+        Args:
+            band_prices (dict): {room_type: prices}, one price per band (len(bands) + 1),
+                                lowest occupancy first. Types left out keep their price.
+            bands (tuple): Increasing occupancy boundaries between bands.
+
+        Raises:
+            ValueError: If a room type does not have one price per band.
+        """
+        rooms = self.rooms
+        sizes = [rooms.codes.count(code) for code in range(len(rooms.type_names))]
+
+        limits, prices = [], []
+        for code, room_type in enumerate(rooms.type_names):
+            if room_type in band_prices:
+                table = tuple(band_prices[room_type])
+                if len(table) != len(bands) + 1:
+                    raise ValueError(f"Room type {room_type} needs {len(bands) + 1} band prices, got {len(table)}")
+                # Occupancy reaches a boundary once booked >= boundary * rooms (with slack for float error)
+                limits.append(tuple(math.ceil(boundary * sizes[code] - 1e-9) for boundary in bands))
+                prices.append(table)
+            else:
+                limits.append(())
+                prices.append((rooms.prices[code],))
+
+        # Every type lock is held, in type order, so a snapshot sees the tables either before or after
+        # the change, and the journal records of the tables are never split across its generations
+        locks = [self.locks[room_type] for room_type in rooms.type_names]
+        for lock in locks:
+            lock.acquire()
+        try:
+            journal = self.journal
+            if journal is not None:
+                # Each table is a header that clears the type's bands, followed by its prices and limits
+                for code, (table, limit) in enumerate(zip(prices, limits)):
+                    journal(JOURNAL_BANDS, code, 0.0)
+                    for price in table:
+                        journal(JOURNAL_BAND_PRICE, code, price)
+                    for booked in limit:
+                        journal(JOURNAL_BAND_LIMIT, code, float(booked))
+
+            self.type_sizes, self.band_prices = sizes, prices
+            self.bands = [-1] * len(sizes)      # Forces every type to take its current band's price
+            self.band_limits = limits
+            for code, room_type in enumerate(rooms.type_names):
+                self._set_band(code)
+                self._notify(room_type)
+        finally:
+            for lock in locks:
+                lock.release()
+
+    def set_season(self, season):
+        """
+        Records the season the hotel's prices are set for.
+
+        Args:
+            season (int): Numeric season value.
+        """
+        self.season = season
+        if self.journal is not None:
+            self.journal(JOURNAL_SEASON, -1 if season is None else season, 0.0)
+
+    def _band(self, code):
+        """
+        Returns the occupancy band a type code is in from its booked-room count.
+        """
+        return bisect_right(self.band_limits[code], self.type_sizes[code] - len(self.rooms.free[code]))
+
+    def _set_band(self, code):
+        """
+        Moves a type code to its current occupancy band and applies the band's price.
+
+        Called with the room type's lock held.
+
+        Returns:
+            float: The new price, or None if the band did not change.
+        """
+        band = self._band(code)
+        if band == self.bands[code]:
+            return None
+        self.bands[code] = band
+        price = self.rooms.prices[code] = self.band_prices[code][band]
+        if self.journal is not None:
+            self.journal(JOURNAL_REPRICE, code, price)
+        return price
+
+    def watch(self, watcher):
+        """
+        Registers a callable notified after every booking, release or price change.
+
+        Args:
+            watcher (callable): Called as watcher(hotel, room_type).
+        """
+        self.watchers.append(watcher)
+
+    def unwatch(self, watcher):
+        """
+        Removes a watcher registered with `watch`.
+
+        Args:
+            watcher (callable): The watcher to remove.
+        """
+        self.watchers.remove(watcher)
+
+    def _notify(self, room_type):
+        """
+        Notifies the watchers that a room type changed.
+
+        Called with the room type's lock held, so watchers see changes in order.
+        """
+        for watcher in self.watchers:
+            watcher(self, room_type)
+
+    def availability(self, type=None):
+        """
+        Returns the available rooms and their prices per room type.
+
+        Args:
+            type (str, optional): Filter for a specific room type. If not provided, includes all types.
+
+        Returns:
+            dict: {room_type: {"price": price, "quantity": available rooms}} for types with free rooms.
+        """
+        rooms = self.rooms
+        codes = range(len(rooms.type_names)) if type is None else \
+            [rooms.type_codes[type]] if type in rooms.type_codes else []
+        return {
+            rooms.type_names[code]: {"price": rooms.prices[code], "quantity": len(rooms.free[code])}
+            for code in codes
+            if rooms.free[code]
+        }
+
     def available_rooms_summary(self, type=None):
         """
-        Displays a summary of available rooms and their prices.
+        Publishes a summary of available rooms and their prices as an "availability_summary" event.
+
+        Attach a `PrintSink` to the instrumentation to display it.
 
         Args:
             type (str, optional): Filter for a specific room type. If not provided, shows all types.
+
+        Returns:
+            dict: The summary, as returned by `availability`.
+        """
+        room_count = self.availability(type)
+        if instrumentation.active:
+            instrumentation.emit("availability_summary", hotel=self.name, rooms=room_count)
+        return room_count
+
+    def book_room(self, type):
         """
-        room_count = {}  # Dictionary to count and store room details
-
-        for room in self.rooms_config:
-            if room["available"]:
-                if type is None or room["room_type"] == type:
-                    if room["room_type"] in room_count:
-                        room_count[room["room_type"]]["quantity"] += 1
-                    else:
-                        room_count[room["room_type"]] = {
-                            "price": room["price"],
-                            "quantity": 1
-                        }
-        
-        # Display the summary of available rooms
-        if not room_count:
-            print("There are no available rooms")
+        Books a free room of a specified type.
+
+        Safe to call from several threads: a room is claimed with a single atomic
+        pop from its type's free list, so it is never handed out twice and the
+        room type's lock is only taken to notify watchers or to reprice the type
+        when its occupancy crosses a band boundary.
+
+        Args:
+            type (str): Type of the room to be booked.
+
+        Returns:
+            int: Id of the booked room, or None if no room of that type is available.
+        """
+        if instrumentation.active:
+            return self._book_room_instrumented(type)
+        return self._claim_room(type)
+
+    def _claim_room(self, type):
+        """
+        Claims a free room of a type for `book_room`.
+        """
+        code = self.rooms.type_codes.get(type)
+        if code is None:
+            return None
+        try:
+            room_id = self.rooms.free[code].pop()
+        except IndexError:
+            return None
+        self.rooms.available[room_id] = 0  # Mark the room as booked
+        if self.journal is not None:
+            self.journal(JOURNAL_BOOK, room_id, 0.0)
+
+        # The band is checked without the lock; only a crossing takes it and reprices the type
+        if self.band_limits and self._band(code) != self.bands[code]:
+            with self.locks[type]:
+                price = self._set_band(code)
+                self._notify(type)
+            if price is not None and instrumentation.active:
+                instrumentation.emit("repricing", hotel=self.name, room_type=type, price=price, band=self.bands[code])
+        elif self.watchers:
+            with self.locks[type]:
+                self._notify(type)
+        return room_id
+
+    def _book_room_instrumented(self, type):
+        """
+        Runs `book_room` while timing it and publishing a "booking" or "rejection" event.
+        """
+        start = instrumentation.start()
+        room_id = self._claim_room(type)
+        if room_id is None:
+            instrumentation.finish("booking", start, "rejection", hotel=self.name, room_type=type)
         else:
-            for room_type, info in room_count.items():
-                print(f'Room {room_type} - Price (per night): {info["price"]} - Availables: {info["quantity"]}')
+            instrumentation.finish("booking", start, "booking", hotel=self.name, room_type=type, room_id=room_id)
+        return room_id
+
+    def release_room(self, room_id):
+        """
+        Releases a booked room so it can be booked again.
+
+        Thread-safe: the room type's lock makes the availability check and update atomic.
+
+        Args:
+            room_id (int): Id of the room returned by `book_room`.
+
+        Returns:
+            bool: True if the room was released, False if it was not booked.
+        """
+        rooms = self.rooms
+        code = rooms.codes[room_id]
+        room_type = rooms.type_names[code]
+        # The lock makes the check-then-set atomic, so concurrent releases of a room cannot both succeed
+        with self.locks[room_type]:
+            if rooms.available[room_id]:
+                return False
+            rooms.available[room_id] = 1
+            rooms.free[code].append(room_id)
+            if self.journal is not None:
+                self.journal(JOURNAL_RELEASE, room_id, 0.0)
+            price = self._set_band(code) if self.band_limits else None
+            if self.watchers:
+                self._notify(room_type)
+        if instrumentation.active:
+            instrumentation.emit("release", hotel=self.name, room_type=room_type, room_id=room_id)
+            if price is not None:
+                instrumentation.emit("repricing", hotel=self.name, room_type=room_type, price=price,
+                                     band=self.bands[code])
+        return True
 
     def get_room(self, type):
         """
         Books a room of a specified type if available.
 
+        The outcome is published as a "booking" or "rejection" event.
+
         Args:
             type (str): Type of the room to be booked.
 
         Returns:
             bool: True if booking was successful, False otherwise.
         """
-        for room in self.rooms_config:
-            if room["room_type"] == type and room["available"]:
-                room["available"] = False  # Mark the room as booked
-                print(f"Room {type} booked")
+        return self.book_room(type) is not None
 
-                # Remove the booked room from the list if necessary
-                if hasattr(self, 'rooms_config'):
-                    self.rooms_config = [r for r in self.rooms_config if r is not room]
-                return True
-        
-        # If no room is available
-        print(f"Room {type} not available")
-        return False
+    async def book_room_async(self, type):
+        """
+        Asyncio variant of `book_room` for use from an event loop.
 
+        Booking never blocks for long (a constant-time pop from the free list),
+        so it is run inline rather than in an executor; it is safe to mix with
+        bookings made from other threads.
 
-                   
-    
-   
\ No newline at end of file
+        Args:
+            type (str): Type of the room to be booked.
+
+        Returns:
+            int: Id of the booked room, or None if no room of that type is available.
+        """
+        return self.book_room(type)
+
+    async def release_room_async(self, room_id):
+        """
+        Asyncio variant of `release_room`.
+
+        Args:
+            room_id (int): Id of the room returned by `book_room`.
+
+        Returns:
+            bool: True if the room was released, False if it was not booked.
+        """
+        return self.release_room(room_id)
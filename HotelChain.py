@@ -0,0 +1,263 @@
+import numpy as np
+
+# Fields of the rows exported by `HotelChain.to_records`, one per hotel and room type
+EXPORT_FIELDS = ("hotel", "room_type", "stars", "location", "rooms", "available", "booked", "occupancy",
+                 "price", "revenue")
+
+class HotelChain:
+    """
+    Registry, search index and revenue aggregates for the hotels of a chain.
+
+    Stars, location, season, per-type room, availability and booked counts, current
+    prices and booked revenue are kept in columnar NumPy arrays, one row per hotel.
+    Every registered `Hotel` is watched, so its row is updated in O(1) on each booking,
+    release or reprice; searches are answered with vectorized filters over the columns
+    and exports gather them without scanning rooms.
+
+    Booked revenue adds the nightly price of every booking seen since the hotel was
+    registered, at the price in force before the booking moved the type to another
+    occupancy band; releases do not refund it.
+    """
+
+    ROOM_TYPES = ("double", "deluxe", "suite")
+
+    def __init__(self, room_types=ROOM_TYPES, initial_rows=1024):
+        """
+        Initializes an empty chain.
+
+        Args:
+            room_types (tuple): Room types indexed by the chain. New types are added as hotels register them.
+            initial_rows (int): Number of hotel rows to allocate up front.
+        """
+        self.hotels = []                                # Registered hotels, indexed by row
+        self.rows = {}                                  # Row of each hotel, by id(hotel)
+        self.type_columns = {room_type: i for i, room_type in enumerate(room_types)}
+        self.location_codes = {}                        # Integer code of each location value
+        self.locations = []                             # Location value of each code
+
+        self.stars = np.zeros(initial_rows, dtype=np.int8)
+        self.location = np.zeros(initial_rows, dtype=np.int32)
+        self.season = np.full(initial_rows, -1, dtype=np.int8)
+        self.active = np.zeros(initial_rows, dtype=bool)
+        self.rooms = np.zeros((initial_rows, len(room_types)), dtype=np.int32)
+        self.available = np.zeros((initial_rows, len(room_types)), dtype=np.int32)
+        self.booked = np.zeros((initial_rows, len(room_types)), dtype=np.int32)
+        self.prices = np.full((initial_rows, len(room_types)), np.nan)
+        self.revenue = np.zeros((initial_rows, len(room_types)))
+
+    def __len__(self):
+        return int(self.active.sum())
+
+    def _grow(self, rows, columns):
+        """
+        Reallocates the columns so they fit the given number of rows and room types.
+        """
+        old_rows, old_columns = self.available.shape
+        if rows <= old_rows and columns <= old_columns:
+            return
+        new_rows = max(rows, old_rows * 2) if rows > old_rows else old_rows
+
+        def _resize(array, fill):
+            shape = (new_rows,) + ((max(columns, old_columns),) if array.ndim == 2 else ())
+            resized = np.full(shape, fill, dtype=array.dtype)
+            resized[tuple(slice(0, n) for n in array.shape)] = array
+            return resized
+
+        self.stars = _resize(self.stars, 0)
+        self.location = _resize(self.location, 0)
+        self.season = _resize(self.season, -1)
+        self.active = _resize(self.active, False)
+        self.rooms = _resize(self.rooms, 0)
+        self.available = _resize(self.available, 0)
+        self.booked = _resize(self.booked, 0)
+        self.prices = _resize(self.prices, np.nan)
+        self.revenue = _resize(self.revenue, 0.0)
+
+    def _location_code(self, location):
+        """
+        Returns the integer code of a location, registering it if it is new.
+        """
+        code = self.location_codes.get(location)
+        if code is None:
+            code = self.location_codes[location] = len(self.locations)
+            self.locations.append(location)
+        return code
+
+    def add_hotel(self, hotel):
+        """
+        Registers a hotel and starts tracking its availability, prices and revenue. Bookings
+        made before are counted as booked but add no revenue.
+
+        Args:
+            hotel (Hotel): Hotel to register.
+
+        Returns:
+            int: Row of the hotel in the chain's columns.
+
+        Raises:
+            ValueError: If the hotel is already registered.
+        """
+        if id(hotel) in self.rows:
+            raise ValueError(f"Hotel {hotel.name} is already registered")
+        for room_type in hotel.prices:
+            if room_type not in self.type_columns:
+                self.type_columns[room_type] = len(self.type_columns)
+
+        row = len(self.hotels)
+        self._grow(row + 1, len(self.type_columns))
+        self.hotels.append(hotel)
+        self.rows[id(hotel)] = row
+
+        self.stars[row] = hotel.stars
+        self.location[row] = self._location_code(hotel.location)
+        self.season[row] = -1 if hotel.season is None else hotel.season
+        self.active[row] = True
+        store = hotel.rooms
+        for code, room_type in enumerate(store.type_names):
+            column = self.type_columns[room_type]
+            self.rooms[row, column] = store.codes.count(code)
+            self.booked[row, column] = self.rooms[row, column] - len(store.free[code])
+        for room_type in hotel.prices:
+            self._update(hotel, room_type)
+        hotel.watch(self._update)
+        return row
+
+    def remove_hotel(self, hotel):
+        """
+        Stops tracking a hotel. Its row is kept but excluded from searches and exports.
+
+        Args:
+            hotel (Hotel): Registered hotel.
+        """
+        row = self.rows.pop(id(hotel))
+        self.active[row] = False
+        hotel.unwatch(self._update)
+
+    def _update(self, hotel, room_type):
+        """
+        Refreshes the counts, price and revenue of one room type of a hotel.
+
+        Runs under the room type's lock, so a type never sees two changes at once.
+        """
+        row = self.rows[id(hotel)]
+        column = self.type_columns[room_type]
+        available = hotel.free_count(room_type)
+        # Read with item(), as Python ints and floats are much cheaper to compare than NumPy scalars
+        booked = self.rooms.item(row, column) - available
+        previous = self.booked.item(row, column)
+        if booked > previous:
+            # Valued at the previous price: a booking that crosses a band reprices the type before notifying
+            self.revenue[row, column] += (booked - previous) * self.prices.item(row, column)
+        self.available[row, column] = available
+        self.booked[row, column] = booked
+        self.prices[row, column] = hotel.room_price(room_type)
+        if hotel.season is not None:
+            self.season[row] = hotel.season
+
+    def search(self, room_type, location=None, min_stars=None, max_stars=None,
+               season=None, max_price=None, sort_by="price", limit=10):
+        """
+        Finds hotels with available rooms of a type matching the given filters.
+
+        Args:
+            room_type (str): Type of room wanted.
+            location (optional): Location value to match.
+            min_stars (int, optional): Minimum star rating.
+            max_stars (int, optional): Maximum star rating.
+            season (int, optional): Season the prices were set for.
+            max_price (float, optional): Maximum price per night.
+            sort_by (str): "price" for cheapest first, or "stars" for highest rating first (then cheapest).
+            limit (int, optional): Maximum number of results. None returns every match.
+
+        Returns:
+            list: (hotel, price, available rooms) tuples in the requested order.
+
+        Raises:
+            ValueError: If `sort_by` is not supported.
+        """
+        column = self.type_columns.get(room_type)
+        if column is None or not self.hotels:
+            return []
+        rows = len(self.hotels)
+        available = self.available[:rows, column]
+        prices = self.prices[:rows, column]
+
+        mask = self.active[:rows] & (available > 0)
+        if location is not None:
+            if location not in self.location_codes:
+                return []
+            mask &= self.location[:rows] == self.location_codes[location]
+        if min_stars is not None:
+            mask &= self.stars[:rows] >= min_stars
+        if max_stars is not None:
+            mask &= self.stars[:rows] <= max_stars
+        if season is not None:
+            mask &= self.season[:rows] == season
+        if max_price is not None:
+            mask &= prices <= max_price
+        matches = np.flatnonzero(mask)
+
+        if sort_by == "price":
+            keys = prices[matches]
+            if limit is not None and limit < len(matches):
+                top = np.argpartition(keys, limit)[:limit]
+                matches, keys = matches[top], keys[top]
+            matches = matches[np.argsort(keys, kind="stable")]
+        elif sort_by == "stars":
+            matches = matches[np.lexsort((prices[matches], -self.stars[matches]))][:limit]
+        else:
+            raise ValueError(f"Unsupported sort_by: {sort_by}")
+
+        return [(self.hotels[row], float(prices[row]), int(available[row])) for row in matches]
+
+    def cheapest(self, room_type, **filters):
+        """
+        Finds the cheapest available room of a type matching the filters of `search`.
+
+        Args:
+            room_type (str): Type of room wanted.
+            **filters: Any filter accepted by `search`.
+
+        Returns:
+            tuple: (hotel, price, available rooms), or None if nothing matches.
+        """
+        results = self.search(room_type, limit=1, **filters)
+        return results[0] if results else None
+
+    def to_records(self):
+        """
+        Exports one row per registered hotel and room type.
+
+        Returns:
+            numpy.recarray: Rows with the `EXPORT_FIELDS` fields, in registration and room type order.
+                            "occupancy" is booked / rooms and "revenue" the booked revenue.
+        """
+        rows = np.flatnonzero(self.active[:len(self.hotels)])
+        hotels = [self.hotels[row] for row in rows]
+        counts = [len(hotel.rooms.type_names) for hotel in hotels]
+        row_index = np.repeat(rows, counts)
+        column_index = np.array([self.type_columns[name] for hotel in hotels for name in hotel.rooms.type_names],
+                                dtype=np.int64)
+
+        # Available rooms follow from the booked count, so a concurrent update cannot make them disagree
+        total = self.rooms[row_index, column_index].astype(np.int64)
+        booked = self.booked[row_index, column_index].astype(np.int64)
+        occupancy = np.divide(booked, total, out=np.zeros(len(total)), where=total > 0)
+        return np.rec.fromarrays(
+            [np.repeat(np.array([hotel.name for hotel in hotels], dtype=str), counts),
+             np.array([name for hotel in hotels for name in hotel.rooms.type_names], dtype=str),
+             self.stars[row_index].astype(np.int16),
+             np.repeat(np.array([hotel.location for hotel in hotels]), counts),
+             total, total - booked, booked, occupancy,
+             self.prices[row_index, column_index], self.revenue[row_index, column_index]],
+            names=EXPORT_FIELDS)
+
+    def to_dataframe(self):
+        """
+        Exports the rows of `to_records` as a pandas DataFrame.
+
+        Returns:
+            pandas.DataFrame: One row per registered hotel and room type, with the `EXPORT_FIELDS` columns.
+        """
+        import pandas as pd
+        return pd.DataFrame.from_records(self.to_records())
@@ -0,0 +1,424 @@
+import gc
+import json
+import os
+import shutil
+import struct
+import threading
+from collections import deque
+from functools import partial
+import numpy as np
+from Hotel_pkg.Hotel import (Hotel, JOURNAL_BOOK, JOURNAL_RELEASE, JOURNAL_REPRICE, JOURNAL_SEASON, JOURNAL_BANDS,
+                             JOURNAL_BAND_PRICE, JOURNAL_BAND_LIMIT)
+from Hotel_pkg.RoomStore import RoomStore
+
+# Journal record: operation, hotel index, room id (book/release) or type code (reprice), price
+RECORD = np.dtype([("operation", "u1"), ("hotel", "<u4"), ("item", "<i4"), ("price", "<f8")])
+_pack_record = struct.Struct("<BIid").pack   # Same 17-byte layout as RECORD
+SNAPSHOT_VERSION = 1
+
+
+class Journal:
+    """
+    Append-only binary journal of hotel changes with group commit.
+
+    Appending only queues a packed record. Records are written and fsynced in batches
+    by `flush`, so a crash loses at most the records of the batch being collected.
+    Once `batch_records` are queued, `append` calls `on_full` so another thread flushes
+    them (`HotelStore` wakes its sync thread); without it, `append` flushes inline.
+    """
+
+    def __init__(self, path, batch_records=4096, on_full=None):
+        """
+        Opens a journal file for appending.
+
+        Args:
+            path (str): Journal file. A partial record left by a crash is truncated.
+            batch_records (int): Queued records that trigger a write and fsync.
+            on_full (callable, optional): Called with no arguments when a batch is ready to flush.
+        """
+        self.path = path
+        self.batch_records = batch_records
+        self.on_full = on_full
+        self.records = 0            # Records written since the journal was opened
+        self._queue = deque()       # Appends and pops at opposite ends are atomic, so appending needs no lock
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+        self._file.truncate(self._file.tell() - self._file.tell() % RECORD.itemsize)
+
+    def append(self, hotel, operation, item, price):
+        """
+        Queues one record.
+
+        Args:
+            hotel (int): Index of the hotel in its `HotelStore`.
+            operation (int): One of the JOURNAL_* operation codes of `Hotel`.
+            item (int): Room id for bookings and releases, season for seasons, type code otherwise.
+            price (float): New price for reprices and band prices, booked-room count for band limits.
+        """
+        self._queue.append(_pack_record(operation, hotel, item, price))
+        if len(self._queue) >= self.batch_records:
+            # Appends run on booking threads, some holding a room type's lock, so the fsync is handed off
+            if self.on_full is not None:
+                self.on_full()
+            else:
+                self.flush()
+
+    def flush(self):
+        """
+        Writes and fsyncs every queued record.
+        """
+        with self._lock:
+            if self._file.closed:
+                return
+            queue = self._queue
+            count = len(queue)
+            if not count:
+                return
+            self._file.write(b"".join([queue.popleft() for _ in range(count)]))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.records += count
+
+    def close(self):
+        """
+        Flushes the queued records and closes the file.
+        """
+        self.flush()
+        with self._lock:
+            self._file.close()
+
+    @staticmethod
+    def read(path):
+        """
+        Reads every complete record of a journal file.
+
+        Args:
+            path (str): Journal file.
+
+        Returns:
+            numpy.ndarray: Records with the `RECORD` dtype.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        return np.frombuffer(data, dtype=RECORD, count=len(data) // RECORD.itemsize)
+
+
+class HotelStore:
+    """
+    Durable state for the hotels of a chain.
+
+    Every booking, release and reprice of a registered hotel is appended to a binary
+    `Journal`. Periodically, the whole chain is written as a snapshot of columnar .npy
+    files (memory-mappable, one column per file) and a new journal generation starts,
+    so recovery loads the latest snapshot and replays only the journal tail.
+
+    Snapshots are taken while bookings continue: the journal is switched first, and the
+    records that reach the new generation are replayed idempotently on top of the snapshot.
+    """
+
+    def __init__(self, directory, batch_records=4096, sync_interval=0.05, snapshot_records=250000):
+        """
+        Prepares an empty store. Use `open` to recover an existing one.
+
+        Args:
+            directory (str): Directory holding the snapshots and journals.
+            batch_records (int): Journal records written and fsynced together.
+            sync_interval (float): Maximum seconds between journal fsyncs. 0 only syncs full batches.
+            snapshot_records (int): Journal records after which a new snapshot is taken. 0 disables it.
+        """
+        self.directory = directory
+        self.batch_records = batch_records
+        self.sync_interval = sync_interval
+        self.snapshot_records = snapshot_records
+        self.hotels = []
+        self.generation = 0
+        self.journal = None
+        self._snapshot_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()      # Set when a journal batch is full or the store closes
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, kind, generation):
+        return os.path.join(self.directory, f"{kind}-{generation:08d}")
+
+    def _generations(self, kind):
+        """
+        Returns the complete generations of snapshots or journals, oldest first.
+        """
+        prefix = f"{kind}-"
+        return sorted(int(entry[len(prefix):]) for entry in os.listdir(self.directory)
+                      if entry.startswith(prefix) and entry[len(prefix):].isdigit())
+
+    @classmethod
+    def open(cls, directory, **options):
+        """
+        Recovers a store: loads its latest snapshot and replays the journals written since.
+
+        Args:
+            directory (str): Directory of the store.
+            **options: Settings of `HotelStore`.
+
+        Returns:
+            HotelStore: The store, journaling again, with the recovered hotels in `hotels`.
+        """
+        store = cls(directory, **options)
+        # Recovery only allocates, so garbage collections over the growing object graph are wasted work
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            snapshots = store._generations("snapshot")
+            if snapshots:
+                store.generation = snapshots[-1]
+                store.hotels = store._load_snapshot(store._path("snapshot", store.generation))
+            for generation in store._generations("journal"):
+                if generation >= store.generation:
+                    store._replay(Journal.read(store._path("journal", generation)))
+                    store.generation = generation
+        finally:
+            if collecting:
+                gc.enable()
+        store._start_journal()
+        return store
+
+    def _start_journal(self):
+        """
+        Opens the journal of the current generation and attaches it to every hotel.
+        """
+        self.journal = Journal(self._path("journal", self.generation), self.batch_records, self._wake.set)
+        for index, hotel in enumerate(self.hotels):
+            hotel.journal = partial(self.journal.append, index)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._sync_loop, name="HotelStore-sync", daemon=True)
+            self._thread.start()
+
+    def _sync_loop(self):
+        while True:
+            self._wake.wait(self.sync_interval or None)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            self.journal.flush()
+            if self.snapshot_records and self.journal.records >= self.snapshot_records:
+                self.snapshot()
+
+    def add_hotels(self, hotels):
+        """
+        Registers hotels and takes a snapshot so their configuration is durable.
+
+        Args:
+            hotels (list): `Hotel` objects.
+        """
+        with self._snapshot_lock:
+            self.hotels.extend(hotels)
+        self.snapshot()
+
+    def sync(self):
+        """
+        Writes and fsyncs every journal record appended so far.
+        """
+        if self.journal is not None:
+            self.journal.flush()
+
+    def close(self):
+        """
+        Stops the background thread, flushes the journal and detaches the hotels.
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.journal is not None:
+            self.journal.close()
+        for hotel in self.hotels:
+            hotel.journal = None
+
+    def snapshot(self):
+        """
+        Writes the whole chain as a new snapshot generation and starts a new journal.
+
+        Older snapshots and journals are removed once the new snapshot is complete.
+        """
+        with self._snapshot_lock:
+            old_journal = self.journal
+            self.generation += 1
+            self._start_journal()
+            columns = self._columns()
+
+            # Written under a temporary name and renamed, so a crash never leaves a partial snapshot
+            path = self._path("snapshot", self.generation)
+            temporary = path + ".tmp"
+            shutil.rmtree(temporary, ignore_errors=True)
+            os.makedirs(temporary)
+            for name, column in columns.items():
+                np.save(os.path.join(temporary, f"{name}.npy"), column)
+            with open(os.path.join(temporary, "meta.json"), "w") as f:
+                json.dump({"version": SNAPSHOT_VERSION, "generation": self.generation,
+                           "hotels": len(self.hotels)}, f)
+            os.rename(temporary, path)
+
+            if old_journal is not None:
+                old_journal.close()
+            for kind in ("snapshot", "journal"):
+                for generation in self._generations(kind):
+                    if generation < self.generation:
+                        old = self._path(kind, generation)
+                        shutil.rmtree(old) if os.path.isdir(old) else os.remove(old)
+
+    def _columns(self):
+        """
+        Gathers the state of every hotel into flat columns.
+        """
+        hotels = self.hotels
+        locations = np.asarray([hotel.location for hotel in hotels])
+        if locations.dtype == object:
+            raise ValueError("Hotel locations must all be numbers or all be strings to be stored")
+        type_counts = [len(hotel.rooms.type_names) for hotel in hotels]
+
+        bands, band_counts, limit_counts, band_prices, band_limits = [], [], [], [], []
+        available, free_counts, free = [], [], []
+        for hotel in hotels:
+            rooms = hotel.rooms
+            # The type locks hold releases back, so each is captured whole. A booking pops its room
+            # before flagging it, and flags are captured first, so a booked flag is never seen with
+            # the room still free; a booking caught halfway is completed by its journal record.
+            # Band tables only change with every type lock held, so they are never captured halfway.
+            locks = [hotel.locks[room_type] for room_type in rooms.type_names]
+            for lock in locks:
+                lock.acquire()
+            try:
+                for code in range(len(rooms.type_names)):
+                    if hotel.band_limits:
+                        bands.append(hotel.bands[code])
+                        band_counts.append(len(hotel.band_prices[code]))
+                        limit_counts.append(len(hotel.band_limits[code]))
+                        band_prices.extend(hotel.band_prices[code])
+                        band_limits.extend(hotel.band_limits[code])
+                    else:
+                        bands.append(-1)
+                        band_counts.append(0)
+                        limit_counts.append(0)
+                available.append(bytes(rooms.available))
+                for stack in rooms.free:
+                    free_counts.append(len(stack))
+                    free.append(stack.tobytes())
+            finally:
+                for lock in locks:
+                    lock.release()
+
+        return {
+            "names": np.array([hotel.name for hotel in hotels], dtype=str),
+            "stars": np.array([hotel.stars for hotel in hotels], dtype=np.int16),
+            "locations": locations,
+            "capacities": np.array([hotel.capacity for hotel in hotels], dtype=np.int64),
+            "seasons": np.array([-1 if hotel.season is None else hotel.season for hotel in hotels], dtype=np.int16),
+            "type_offsets": np.concatenate([[0], np.cumsum(type_counts, dtype=np.int64)]),
+            "type_names": np.array([name for hotel in hotels for name in hotel.rooms.type_names], dtype=str),
+            "prices": np.frombuffer(b"".join(hotel.rooms.prices.tobytes() for hotel in hotels), dtype=np.float64),
+            "room_offsets": np.concatenate([[0], np.cumsum([len(hotel.rooms) for hotel in hotels], dtype=np.int64)]),
+            "codes": np.frombuffer(b"".join(hotel.rooms.codes.tobytes() for hotel in hotels), dtype=np.uint8),
+            "available": np.frombuffer(b"".join(available), dtype=np.uint8),
+            "free_offsets": np.concatenate([[0], np.cumsum(free_counts, dtype=np.int64)]),
+            "free": np.frombuffer(b"".join(free), dtype=np.int32),
+            "bands": np.array(bands, dtype=np.int16),
+            "band_offsets": np.concatenate([[0], np.cumsum(band_counts, dtype=np.int64)]),
+            "band_prices": np.array(band_prices, dtype=np.float64),
+            "limit_offsets": np.concatenate([[0], np.cumsum(limit_counts, dtype=np.int64)]),
+            "band_limits": np.array(band_limits, dtype=np.int64),
+        }
+
+    @staticmethod
+    def _load_snapshot(path):
+        """
+        Rebuilds the hotels of a snapshot.
+        """
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        if meta["version"] != SNAPSHOT_VERSION:
+            raise ValueError(f"{path} has snapshot version {meta['version']}")
+        columns = {entry[:-4]: np.load(os.path.join(path, entry), mmap_mode="r")
+                   for entry in os.listdir(path) if entry.endswith(".npy")}
+
+        # Python lists and bytes slice far faster than memory-mapped arrays, one hotel at a time
+        type_offsets = columns["type_offsets"].tolist()
+        room_offsets = columns["room_offsets"].tolist()
+        free_offsets = columns["free_offsets"].tolist()
+        band_offsets = columns["band_offsets"].tolist()
+        type_names = columns["type_names"].tolist()
+        prices = columns["prices"].tolist()
+        bands = columns["bands"].tolist()
+        band_prices = columns["band_prices"].tolist()
+        band_limits = columns["band_limits"].tolist()
+        codes = columns["codes"].tobytes()
+        available = columns["available"].tobytes()
+        free = columns["free"].tobytes()
+        itemsize = columns["free"].itemsize
+        limit_offsets = columns["limit_offsets"].tolist()
+        # Global type index of every room, to count the rooms of each type
+        room_types = columns["codes"].astype(np.int64) + np.repeat(type_offsets[:-1], np.diff(room_offsets))
+        type_sizes = np.bincount(room_types, minlength=len(type_names)).tolist()
+
+        hotels = []
+        for index, (name, stars, location, capacity, season) in enumerate(zip(
+                columns["names"].tolist(), columns["stars"].tolist(), columns["locations"].tolist(),
+                columns["capacities"].tolist(), columns["seasons"].tolist())):
+            first, last = type_offsets[index], type_offsets[index + 1]
+            start, end = room_offsets[index], room_offsets[index + 1]
+            store = RoomStore.from_arrays(
+                type_names[first:last], prices[first:last], codes[start:end], available[start:end],
+                [free[free_offsets[t] * itemsize:free_offsets[t + 1] * itemsize] for t in range(first, last)])
+            hotel = Hotel.from_store(name, stars, store, location, capacity)
+            hotel.season = None if season < 0 else season
+
+            if first < last and bands[first] >= 0:
+                hotel.type_sizes = type_sizes[first:last]
+                hotel.bands = bands[first:last]
+                hotel.band_prices = [tuple(band_prices[band_offsets[t]:band_offsets[t + 1]]) for t in range(first, last)]
+                hotel.band_limits = [tuple(band_limits[limit_offsets[t]:limit_offsets[t + 1]]) for t in range(first, last)]
+            hotels.append(hotel)
+        return hotels
+
+    def _replay(self, records):
+        """
+        Applies journal records to the hotels. Replaying a change already in the snapshot has no effect.
+        """
+        stores = [hotel.rooms for hotel in self.hotels]
+        # Column lists convert far faster than a list of structured records
+        for operation, index, item, price in zip(records["operation"].tolist(), records["hotel"].tolist(),
+                                                 records["item"].tolist(), records["price"].tolist()):
+            rooms = stores[index]
+            if operation == JOURNAL_BOOK:
+                if rooms.available[item]:
+                    rooms.available[item] = 0
+                    stack = rooms.free[rooms.codes[item]]
+                    if stack and stack[-1] == item:
+                        stack.pop()
+                    elif item in stack:     # Booked out of order by concurrent threads, or popped before the snapshot
+                        stack.remove(item)
+            elif operation == JOURNAL_RELEASE:
+                if not rooms.available[item]:
+                    rooms.available[item] = 1
+                    rooms.free[rooms.codes[item]].append(item)
+            elif operation == JOURNAL_REPRICE:
+                rooms.prices[item] = price
+            elif operation == JOURNAL_BAND_PRICE:
+                hotel = self.hotels[index]
+                hotel.band_prices[item] += (price,)
+            elif operation == JOURNAL_BAND_LIMIT:
+                hotel = self.hotels[index]
+                hotel.band_limits[item] += (int(price),)
+            elif operation == JOURNAL_BANDS:
+                hotel = self.hotels[index]
+                if not hotel.band_limits:
+                    types = len(rooms.type_names)
+                    hotel.type_sizes = [rooms.codes.count(code) for code in range(types)]
+                    hotel.band_prices, hotel.band_limits, hotel.bands = [()] * types, [()] * types, [-1] * types
+                hotel.band_prices[item], hotel.band_limits[item] = (), ()
+            elif operation == JOURNAL_SEASON:
+                self.hotels[index].season = None if item < 0 else item
+
+        # Occupancy bands follow the replayed bookings; prices come from the journal as recorded
+        for hotel in self.hotels:
+            if hotel.band_limits:
+                hotel.bands = [hotel._band(code) for code in range(len(hotel.bands))]
@@ -0,0 +1,234 @@
+import csv
+import json
+import os
+from itertools import islice
+from Hotel_pkg.Instrumentation import instrumentation
+
+# Columns of a request row, named after the `Guest` attributes
+REQUEST_FIELDS = ("id", "name", "nights_at_hotel", "room_type")
+# Columns of a result row
+RESULT_FIELDS = ("id", "room_type", "nights_at_hotel", "status", "room_id", "price", "reason")
+
+
+def _format(path, format):
+    """
+    Returns the explicit format, or guesses it from the file extension.
+    """
+    if format is not None:
+        return format
+    extension = os.path.splitext(path)[1].lower() if isinstance(path, str) else ""
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"Cannot tell the format of {path!r}; pass format='csv' or format='jsonl'")
+
+
+def _nights(value):
+    """
+    Parses a number of nights, returning 0 if it is not a positive integer.
+    """
+    try:
+        nights = int(value)
+    except (TypeError, ValueError):
+        return 0
+    return nights if nights > 0 else 0
+
+
+def _csv_rows(file):
+    """
+    Yields (id, name, nights, room_type) tuples from a CSV file with a header row.
+    """
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if header is None:
+        return
+    try:
+        columns = [header.index(field) for field in ("id", "nights_at_hotel", "room_type")]
+    except ValueError:
+        raise ValueError(f"CSV header must contain id, nights_at_hotel and room_type, got {header}") from None
+    id_column, nights_column, type_column = columns
+    name_column = header.index("name") if "name" in header else None
+    width = max(columns) + 1
+    parsed = {}     # Parsed value of each distinct nights field, as feeds repeat a few values
+    for row in reader:
+        if len(row) < width:
+            if row:  # Short rows are rejected rather than dropped, so every request gets a result
+                yield (row[id_column] if len(row) > id_column else "", None, 0, "")
+            continue
+        text = row[nights_column]
+        nights = parsed.get(text)
+        if nights is None:
+            nights = _nights(text)
+            if len(parsed) < 1024:
+                parsed[text] = nights
+        # The name is optional, so a row may stop before its column
+        name = row[name_column] if name_column is not None and len(row) > name_column else None
+        yield (row[id_column], name, nights, row[type_column])
+
+
+def _jsonl_rows(file):
+    """
+    Yields (id, name, nights, room_type) tuples from a JSON Lines file.
+    """
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            room_type = request.get("room_type", "")
+            if not isinstance(room_type, str):  # Lists or objects cannot name a room type
+                yield (request.get("id"), request.get("name"), 0, "")
+                continue
+            yield (request.get("id"), request.get("name"), _nights(request.get("nights_at_hotel")), room_type)
+        except (ValueError, AttributeError):
+            yield (None, None, 0, "")
+
+
+def read_chunks(source, chunk_size=10000, format=None):
+    """
+    Streams booking requests from a CSV or JSON Lines feed in chunks.
+
+    Only one chunk is held in memory at a time. Rows use the `Guest` attribute names
+    (id, name, nights_at_hotel, room_type); nights that are not a positive integer
+    and room types that are not strings are read as 0 nights and rejected later.
+
+    Args:
+        source (str or file): Path or open text file.
+        chunk_size (int): Requests per chunk.
+        format (str, optional): "csv" or "jsonl". Guessed from the file extension if omitted.
+
+    Yields:
+        dict: Chunk with "ids", "names", "nights" and "room_types" lists, in file order.
+    """
+    format = _format(source if isinstance(source, str) else getattr(source, "name", None), format)
+    file = open(source, newline="") if isinstance(source, str) else source
+    try:
+        rows = _csv_rows(file) if format == "csv" else _jsonl_rows(file)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            ids, names, nights, room_types = zip(*chunk)
+            yield {"ids": ids, "names": names, "nights": nights, "room_types": room_types}
+    finally:
+        if file is not source:
+            file.close()
+
+
+def process_chunk(hotel, chunk):
+    """
+    Prices and books the requests of a chunk against a hotel's inventory.
+
+    Requests are booked in file order with `Hotel.book_room`. Each one is quoted, with the
+    same rounding as `Guest.total_guest_price`, at the price of its room type read right
+    before its own booking, so occupancy repricing within the chunk reaches later requests
+    as it does through `Guest`.
+
+    Args:
+        hotel (Hotel): Hotel to book.
+        chunk (dict): Chunk from `read_chunks`.
+
+    Returns:
+        dict: The chunk's "ids", "room_types" and "nights", plus "room_ids" (None if rejected),
+              "prices" (total stay price, None if rejected) and "reasons" (None if accepted,
+              else "invalid_request", "unknown_room_type" or "not_available").
+    """
+    type_codes, prices = hotel.rooms.type_codes, hotel.rooms.prices
+    room_types, nights = chunk["room_types"], chunk["nights"]
+
+    book = hotel.book_room
+    room_ids, totals, reasons = [], [], []
+    for room_type, stay in zip(room_types, nights):
+        code = type_codes.get(room_type) if stay else None
+        if code is None:
+            room_ids.append(None)
+            totals.append(None)
+            reasons.append("invalid_request" if not stay else "unknown_room_type")
+            continue
+        price = prices[code]
+        room_id = book(room_type)
+        room_ids.append(room_id)
+        if room_id is not None:
+            totals.append(round(price * stay, 2))
+            reasons.append(None)
+        else:
+            totals.append(None)
+            reasons.append("not_available")
+
+    return {"ids": chunk["ids"], "room_types": room_types, "nights": nights,
+            "room_ids": room_ids, "prices": totals, "reasons": reasons}
+
+
+def _csv_writer(file):
+    writer = csv.writer(file)
+    writer.writerow(RESULT_FIELDS)
+
+    def write(result):
+        writer.writerows(
+            (id, room_type, nights, "rejected" if reason else "accepted",
+             "" if room_id is None else room_id, "" if price is None else price, reason or "")
+            for id, room_type, nights, room_id, price, reason in zip(
+                result["ids"], result["room_types"], result["nights"],
+                result["room_ids"], result["prices"], result["reasons"]))
+    return write
+
+
+def _jsonl_writer(file):
+    dumps = json.dumps
+
+    def write(result):
+        file.writelines(
+            dumps(dict(zip(RESULT_FIELDS, (id, room_type, nights, "rejected" if reason else "accepted",
+                                           room_id, price, reason)))) + "\n"
+            for id, room_type, nights, room_id, price, reason in zip(
+                result["ids"], result["room_types"], result["nights"],
+                result["room_ids"], result["prices"], result["reasons"]))
+    return write
+
+
+def ingest(source, hotel, destination, chunk_size=10000, format=None, output_format=None):
+    """
+    Streams a feed of booking requests into a hotel and writes one result row per request.
+
+    Reading, pricing, booking and writing are chained chunk by chunk, so memory use
+    does not grow with the size of the feed and results are written as they are decided.
+
+    Args:
+        source (str or file): Feed path or open text file (CSV or JSON Lines).
+        hotel (Hotel): Hotel to book.
+        destination (str or file): Results path or open text file.
+        chunk_size (int): Requests per chunk.
+        format (str, optional): Format of the feed, guessed from its extension if omitted.
+        output_format (str, optional): Format of the results. Defaults to the destination's
+                                       extension, or to the feed's format.
+
+    Returns:
+        dict: "requests", "accepted" and "rejected" counts and the accepted "revenue".
+    """
+    if output_format is None:
+        name = destination if isinstance(destination, str) else getattr(destination, "name", None)
+        try:
+            output_format = _format(name, None)
+        except ValueError:
+            output_format = _format(source if isinstance(source, str) else getattr(source, "name", None), format)
+    file = open(destination, "w", newline="") if isinstance(destination, str) else destination
+    try:
+        write = _csv_writer(file) if output_format == "csv" else _jsonl_writer(file)
+        summary = {"requests": 0, "accepted": 0, "rejected": 0, "revenue": 0.0}
+        for chunk in read_chunks(source, chunk_size, format):
+            result = process_chunk(hotel, chunk)
+            write(result)
+            accepted = [price for price in result["prices"] if price is not None]
+            summary["requests"] += len(result["ids"])
+            summary["accepted"] += len(accepted)
+            summary["rejected"] += len(result["ids"]) - len(accepted)
+            summary["revenue"] += sum(accepted)
+            if instrumentation.active:
+                instrumentation.emit("ingest_chunk", hotel=hotel.name, requests=len(result["ids"]),
+                                     accepted=len(accepted))
+        summary["revenue"] = round(summary["revenue"], 2)
+        return summary
+    finally:
+        if file is not destination:
+            file.close()
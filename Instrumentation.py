@@ -0,0 +1,222 @@
+import time
+from collections import Counter, deque
+
+class LatencyHistogram:
+    """
+    Latency histogram with power-of-two nanosecond buckets.
+    """
+
+    def __init__(self):
+        self.buckets = [0] * 64     # Bucket i counts latencies in [2 ** (i - 1), 2 ** i) ns
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, nanoseconds):
+        """
+        Adds one latency sample.
+
+        Args:
+            nanoseconds (int): Measured latency.
+        """
+        self.buckets[min(nanoseconds.bit_length(), 63)] += 1
+        self.count += 1
+        self.total += nanoseconds
+        if nanoseconds > self.max:
+            self.max = nanoseconds
+
+    def percentile(self, q):
+        """
+        Returns an upper bound of a latency percentile.
+
+        Args:
+            q (float): Percentile between 0 and 100.
+
+        Returns:
+            int: Upper edge in ns of the bucket holding the percentile, 0 if empty.
+        """
+        if not self.count:
+            return 0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(2 ** i, self.max)
+        return self.max
+
+    def summary(self):
+        """
+        Returns the count, mean, p50, p99 and max latency in ns.
+        """
+        return {
+            "count": self.count,
+            "mean_ns": self.total / self.count if self.count else 0.0,
+            "p50_ns": self.percentile(50),
+            "p99_ns": self.percentile(99),
+            "max_ns": self.max,
+        }
+
+
+class Instrumentation:
+    """
+    Event and metrics hub for pricing, booking and payroll.
+
+    Events go to the registered sinks, called as sink(event, fields). When metrics are
+    enabled, every event is counted and timed operations feed a latency histogram.
+    With no sink and metrics disabled the hub is quiet: hot paths only check `active`.
+    """
+
+    def __init__(self):
+        self.sinks = []
+        self.counters = Counter()
+        self.histograms = {}
+        self.metrics_enabled = False
+        self.active = False         # True if there is a sink or metrics are enabled
+
+    def _refresh(self):
+        self.active = bool(self.sinks) or self.metrics_enabled
+
+    def add_sink(self, sink):
+        """
+        Registers a sink for every event.
+
+        Args:
+            sink (callable): Called as sink(event, fields), with fields as a dict.
+        """
+        self.sinks.append(sink)
+        self._refresh()
+
+    def remove_sink(self, sink):
+        """
+        Removes a sink registered with `add_sink`.
+
+        Args:
+            sink (callable): The sink to remove.
+        """
+        self.sinks.remove(sink)
+        self._refresh()
+
+    def enable_metrics(self, enabled=True):
+        """
+        Turns the built-in counters and latency histograms on or off.
+
+        Args:
+            enabled (bool): Whether metrics are collected.
+        """
+        self.metrics_enabled = enabled
+        self._refresh()
+
+    def reset_metrics(self):
+        """
+        Clears the counters and histograms.
+        """
+        self.counters = Counter()
+        self.histograms = {}
+
+    def start(self):
+        """
+        Returns a start timestamp for `finish`, or 0 when quiet.
+        """
+        return time.perf_counter_ns() if self.active else 0
+
+    def finish(self, operation, start, event=None, **fields):
+        """
+        Records the latency of an operation started with `start` and emits its event.
+
+        Args:
+            operation (str): Histogram to record the latency in (e.g. "booking", "pricing").
+            start (int): Timestamp returned by `start`.
+            event (str, optional): Event to emit once the operation is done.
+            **fields: Fields of the event.
+        """
+        if self.metrics_enabled:
+            histogram = self.histograms.get(operation)
+            if histogram is None:
+                histogram = self.histograms[operation] = LatencyHistogram()
+            histogram.record(time.perf_counter_ns() - start)
+        if event is not None:
+            self.emit(event, **fields)
+
+    def emit(self, event, **fields):
+        """
+        Counts an event and sends it to every sink.
+
+        Args:
+            event (str): Event name (e.g. "booking", "rejection", "repricing", "salary").
+            **fields: Fields of the event.
+        """
+        if self.metrics_enabled:
+            self.counters[event] += 1
+        for sink in self.sinks:
+            sink(event, fields)
+
+    def snapshot(self):
+        """
+        Returns the current counters and histogram summaries.
+
+        Returns:
+            dict: {"counters": {event: count}, "latency": {operation: summary}}.
+        """
+        return {
+            "counters": dict(self.counters),
+            "latency": {operation: h.summary() for operation, h in self.histograms.items()},
+        }
+
+
+class PrintSink:
+    """
+    Sink that prints events as the human-readable messages of the demo.
+    """
+
+    def __call__(self, event, fields):
+        message = getattr(self, f"_{event}", None)
+        print(message(**fields) if message is not None else f"{event}: {fields}")
+
+    def _booking(self, room_type, **fields):
+        return f"Room {room_type} booked"
+
+    def _rejection(self, room_type, **fields):
+        return f"Room {room_type} not available"
+
+    def _guest_booking(self, room_type, nights=None, **fields):
+        if nights is None:
+            return f"You have successfully booked a {room_type} room"
+        return f"You have successfully booked a {room_type} room for {nights} nights"
+
+    def _guest_rejection(self, room_type, nights=None, **fields):
+        if nights is None:
+            return f"Room type: {room_type} is not available"
+        return f"Room type: {room_type} is not available for {nights} nights"
+
+    def _quote(self, nights, price, **fields):
+        return f'Your total cost for {nights} nights is {price}'
+
+    def _quote_rejection(self, room_type, **fields):
+        return f"Error: Room type '{room_type}' is not available or invalid in configuration."
+
+    def _availability_summary(self, rooms, **fields):
+        if not rooms:
+            return "There are no available rooms"
+        return "\n".join(f'Room {room_type} - Price (per night): {info["price"]} - Availables: {info["quantity"]}'
+                         for room_type, info in rooms.items())
+
+
+class MemorySink:
+    """
+    Sink that keeps the most recent events in memory.
+    """
+
+    def __init__(self, maxlen=10000):
+        """
+        Args:
+            maxlen (int): Maximum number of events kept.
+        """
+        self.events = deque(maxlen=maxlen)
+
+    def __call__(self, event, fields):
+        self.events.append((event, fields))
+
+
+# Hub shared by every module of the package
+instrumentation = Instrumentation()
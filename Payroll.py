@@ -0,0 +1,100 @@
+import numpy as np
+from Hotel_pkg.EmployeeSalary import EmployeeSalary
+from Hotel_pkg.Instrumentation import instrumentation
+
+# Compiled salary model shared by every payroll run and employee, built on first use
+_salary_model = None
+
+
+def get_salary_model():
+    """
+    Returns the compiled EmployeeSalary model shared across the chain.
+
+    The rule base is identical for every employee, so it is compiled only once
+    per process instead of once per `Employee`.
+
+    Returns:
+        EmployeeSalary: Salary model running on the compiled `MamdaniEngine`.
+    """
+    global _salary_model
+    if _salary_model is None:
+        _salary_model = EmployeeSalary(compiled=True)
+    return _salary_model
+
+
+class Payroll:
+    """
+    Computes the final salaries of many employees in a single batched call.
+    """
+
+    def __init__(self, model=None):
+        """
+        Initializes the payroll with a salary model.
+
+        Args:
+            model (EmployeeSalary, optional): Salary model to use. Defaults to the shared compiled model.
+        """
+        self.model = model if model is not None else get_salary_model()
+
+    def final_salaries(self, job_positions, hotel_ratings, base_salaries):
+        """
+        Calculates the final salaries for arrays of employees.
+
+        Args:
+            job_positions (array-like): Job position levels (1-5).
+            hotel_ratings (array-like): Hotel star ratings (3-5 stars).
+            base_salaries (array-like): Base salaries of the employees.
+
+        Returns:
+            numpy.ndarray: Final salaries rounded to 2 decimals.
+
+        Raises:
+            ValueError: If no salary rule covers some (job_position, hotel_rating) pair.
+        """
+        salaries = self.model.salary_calculations(job_positions, hotel_ratings, base_salaries)
+        uncovered = np.flatnonzero(np.isnan(salaries))
+        if uncovered.size:
+            raise ValueError(f"No salary rule covers {uncovered.size} employee(s), first at index {uncovered[0]}")
+        salaries = np.round(salaries, 2)
+        if instrumentation.active:
+            instrumentation.emit("payroll", employees=salaries.size, total=float(salaries.sum()))
+        return salaries
+
+    def employee_salaries(self, employees, update=False):
+        """
+        Calculates the final salaries of a list of `Employee` objects.
+
+        As in `Employee.monthly_salary`, the multiplier is applied to each employee's current
+        `salary`, so updating the employees compounds it on a later run.
+
+        Args:
+            employees (list): Employees to pay.
+            update (bool): If True, stores each result in the employee's `salary` attribute.
+
+        Returns:
+            numpy.ndarray: Final salaries in the same order as `employees`.
+        """
+        count = len(employees)
+        job_positions = np.fromiter((e.job_position for e in employees), dtype=np.float64, count=count)
+        hotel_ratings = np.fromiter((e.hotel_rating for e in employees), dtype=np.float64, count=count)
+        base_salaries = np.fromiter((e.salary for e in employees), dtype=np.float64, count=count)
+
+        salaries = self.final_salaries(job_positions, hotel_ratings, base_salaries)
+        if update:
+            for employee, salary in zip(employees, salaries.tolist()):
+                employee.salary = salary
+        return salaries
+
+    def total(self, job_positions, hotel_ratings, base_salaries):
+        """
+        Calculates the total monthly payroll.
+
+        Args:
+            job_positions (array-like): Job position levels (1-5).
+            hotel_ratings (array-like): Hotel star ratings (3-5 stars).
+            base_salaries (array-like): Base salaries of the employees.
+
+        Returns:
+            float: Sum of the final salaries.
+        """
+        return float(self.final_salaries(job_positions, hotel_ratings, base_salaries).sum())
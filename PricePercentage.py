@@ -1,6 +1,111 @@
 import numpy as np
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
+from Hotel_pkg.FuzzyEngine import build_skfuzzy, load_engine
+from Hotel_pkg.Instrumentation import instrumentation
+
+# Multiplier levels, from cheapest to most expensive
+MULTIPLIER_LEVELS = ("lowest", "low", "medium", "high", "very_high")
+
+# Levels each occupancy term raises the multiplier of the base rules by
+OCCUPANCY_SHIFT = {"low": 0, "medium": 1, "high": 2}
+
+# Occupancy boundaries at which a `Hotel` reprices a room type. Each band is priced at its
+# lower bound, where a single occupancy term is fully active, so an empty hotel keeps the
+# prices of the season, room type and location alone.
+OCCUPANCY_BANDS = (0.5, 0.8)
+
+# (season, room_type, location) -> multiplier at low occupancy
+BASE_RULES = [
+    # Low season, double room
+    ("low", "double", "mar", "low"),
+    ("low", "double", "ciudad", "lowest"),
+    ("low", "double", "rural", "lowest"),
+
+    # Low season, deluxe room
+    ("low", "deluxe", "mar", "medium"),
+    ("low", "deluxe", "ciudad", "low"),
+    ("low", "deluxe", "rural", "low"),
+
+    # Low season, suite
+    ("low", "suite", "mar", "high"),
+    ("low", "suite", "ciudad", "medium"),
+    ("low", "suite", "rural", "medium"),
+
+    # Medium season, double room
+    ("medium", "double", "mar", "medium"),
+    ("medium", "double", "ciudad", "low"),
+    ("medium", "double", "rural", "lowest"),
+
+    # Medium season, deluxe room
+    ("medium", "deluxe", "mar", "high"),
+    ("medium", "deluxe", "ciudad", "medium"),
+    ("medium", "deluxe", "rural", "low"),
+
+    # Medium season, suite
+    ("medium", "suite", "mar", "very_high"),
+    ("medium", "suite", "ciudad", "high"),
+    ("medium", "suite", "rural", "medium"),
+
+    # High season
+    ("high", "double", "mar", "high"),
+    ("high", "double", "ciudad", "high"),
+    ("high", "double", "rural", "medium"),
+    ("high", "deluxe", "mar", "high"),
+    ("high", "deluxe", "ciudad", "high"),
+    ("high", "deluxe", "rural", "medium"),
+    ("high", "suite", "mar", "very_high"),
+    ("high", "suite", "ciudad", "very_high"),
+    ("high", "suite", "rural", "high"),
+]
+
+# Fuzzy pricing model as plain data, shared by the skfuzzy simulation and the compiled engine.
+# Its digest keys the compiled artifact, so any change here rebuilds it.
+PRICE_MODEL = {
+    "inputs": [
+        # 0: low, 1: medium, 2: high
+        ("season", (0, 3, 1), {"low": ("trimf", (0, 0, 1)),
+                               "medium": ("trimf", (0, 1, 2)),
+                               "high": ("trimf", (1, 2, 2))}),
+        # 0: double, 1: deluxe, 2: suite
+        ("room_type", (0, 3, 1), {"double": ("trimf", (0, 0, 1)),
+                                  "deluxe": ("trimf", (0, 1, 2)),
+                                  "suite": ("trimf", (1, 2, 2))}),
+        # 0: rural, 1: city, 2: sea
+        ("location", (0, 3, 1), {"rural": ("trimf", (0, 0, 1)),
+                                 "ciudad": ("trimf", (0, 1, 2)),
+                                 "mar": ("trimf", (1, 2, 2))}),
+        # Fraction of the rooms of the type that are booked; each term peaks alone at a band's lower bound
+        ("occupancy", (0, 1.1, 0.1), {"low": ("trimf", (0, 0, 0.5)),
+                                      "medium": ("trimf", (0, 0.5, 0.8)),
+                                      "high": ("trapmf", (0.5, 0.8, 1, 1))}),
+    ],
+    "output": ("multiplier", (0.5, 2.1, 0.1), {"lowest": ("trimf", (0.5, 0.8, 1.0)),
+                                               "low": ("trimf", (0.9, 1.0, 1.2)),
+                                               "medium": ("trimf", (1.1, 1.3, 1.5)),
+                                               "high": ("trimf", (1.4, 1.7, 2.0)),
+                                               "very_high": ("trimf", (1.8, 2.1, 2.5))}),
+    # (season, room_type, location, occupancy) -> multiplier
+    "rules": [({"season": season, "room_type": room, "location": location, "occupancy": occupancy},
+               MULTIPLIER_LEVELS[min(MULTIPLIER_LEVELS.index(multiplier) + shift, len(MULTIPLIER_LEVELS) - 1)])
+              for season, room, location, multiplier in BASE_RULES
+              for occupancy, shift in OCCUPANCY_SHIFT.items()],
+}
+
+# Compiled pricing model shared by every hotel, loaded on first use
+_pricing_model = None
+
+
+def get_pricing_model():
+    """
+    Returns the compiled PricePercentage model shared across the chain.
+
+    Returns:
+        PricePercentage: Pricing model running on the compiled `MamdaniEngine`.
+    """
+    global _pricing_model
+    if _pricing_model is None:
+        _pricing_model = PricePercentage(compiled=True)
+    return _pricing_model
+
 
 class PricePercentage:
     """
@@ -8,99 +113,56 @@ class PricePercentage:
     The factors include location, season, and room type.
     """
     
-    def __init__(self):
+    def __init__(self, compiled=False):
         """
-        Initializes the fuzzy logic system with input and output variables and their membership functions.
-        Defines the fuzzy rules for determining the price multiplier.
+        Initializes the fuzzy logic system from `PRICE_MODEL`.
+
+        Args:
+            compiled (bool): If True, every calculation runs on the compiled `MamdaniEngine`,
+                             loaded from its on-disk artifact; skfuzzy is not imported and
+                             the skfuzzy variables, rules and simulation are not built.
+                             Otherwise the skfuzzy simulation is built on the first
+                             `calculate_multiplier` call.
         """
-        # Fuzzy inputs: location, season, and room type
-        self.location = ctrl.Antecedent(np.arange(0, 3, 1), 'location')
-        self.season = ctrl.Antecedent(np.arange(0, 3, 1), 'season')  # 0: low, 1: medium, 2: high
-        self.room_type = ctrl.Antecedent(np.arange(0, 3, 1), 'room_type')  # 0: double, 1: deluxe, 2: suite
-        
-        # Fuzzy output: price multiplier
-        self.multiplier = ctrl.Consequent(np.arange(0.5, 2.1, 0.1), 'multiplier')
-
-        # Define membership functions for 'season'
-        self.season['low'] = fuzz.trimf(self.season.universe, [0, 0, 1])
-        self.season['medium'] = fuzz.trimf(self.season.universe, [0, 1, 2])
-        self.season['high'] = fuzz.trimf(self.season.universe, [1, 2, 2])
-
-        # Define membership functions for 'room_type'
-        self.room_type['double'] = fuzz.trimf(self.room_type.universe, [0, 0, 1])
-        self.room_type['deluxe'] = fuzz.trimf(self.room_type.universe, [0, 1, 2])
-        self.room_type['suite'] = fuzz.trimf(self.room_type.universe, [1, 2, 2])
-        
-        # Define membership functions for 'location'
-        self.location['rural'] = fuzz.trimf(self.location.universe, [0, 0, 1])
-        self.location['ciudad'] = fuzz.trimf(self.location.universe, [0, 1, 2])
-        self.location['mar'] = fuzz.trimf(self.location.universe, [1, 2, 2])
-
-        # Define membership functions for 'multiplier'
-        self.multiplier['lowest'] = fuzz.trimf(self.multiplier.universe, [0.5, 0.8, 1.0])
-        self.multiplier['low'] = fuzz.trimf(self.multiplier.universe, [0.9, 1.0, 1.2])
-        self.multiplier['medium'] = fuzz.trimf(self.multiplier.universe, [1.1, 1.3, 1.5])
-        self.multiplier['high'] = fuzz.trimf(self.multiplier.universe, [1.4, 1.7, 2.0])
-        self.multiplier['very_high'] = fuzz.trimf(self.multiplier.universe, [1.8, 2.1, 2.5])
-
-        # Define fuzzy rules
-        self.rules = [
-            # Low season, double room
-            ctrl.Rule(self.season['low'] & self.room_type['double'] & self.location['mar'], self.multiplier['low']),
-            ctrl.Rule(self.season['low'] & self.room_type['double'] & self.location['ciudad'], self.multiplier['lowest']),
-            ctrl.Rule(self.season['low'] & self.room_type['double'] & self.location['rural'], self.multiplier['lowest']),
-            
-            # Low season, deluxe room
-            ctrl.Rule(self.season['low'] & self.room_type['deluxe'] & self.location['mar'], self.multiplier['medium']),
-            ctrl.Rule(self.season['low'] & self.room_type['deluxe'] & self.location['ciudad'], self.multiplier['low']),
-            ctrl.Rule(self.season['low'] & self.room_type['deluxe'] & self.location['rural'], self.multiplier['low']),
-            
-            # Low season, suite
-            ctrl.Rule(self.season['low'] & self.room_type['suite'] & self.location['mar'], self.multiplier['high']),
-            ctrl.Rule(self.season['low'] & self.room_type['suite'] & self.location['ciudad'], self.multiplier['medium']),
-            ctrl.Rule(self.season['low'] & self.room_type['suite'] & self.location['rural'], self.multiplier['medium']),
-            
-            # Medium season, double room
-            ctrl.Rule(self.season['medium'] & self.room_type['double'] & self.location['mar'], self.multiplier['medium']),
-            ctrl.Rule(self.season['medium'] & self.room_type['double'] & self.location['ciudad'], self.multiplier['low']),
-            ctrl.Rule(self.season['medium'] & self.room_type['double'] & self.location['rural'], self.multiplier['lowest']),
-            
-            # Medium season, deluxe room
-            ctrl.Rule(self.season['medium'] & self.room_type['deluxe'] & self.location['mar'], self.multiplier['high']),
-            ctrl.Rule(self.season['medium'] & self.room_type['deluxe'] & self.location['ciudad'], self.multiplier['medium']),
-            ctrl.Rule(self.season['medium'] & self.room_type['deluxe'] & self.location['rural'], self.multiplier['low']),
-            
-            # Medium season, suite
-            ctrl.Rule(self.season['medium'] & self.room_type['suite'] & self.location['mar'], self.multiplier['very_high']),
-            ctrl.Rule(self.season['medium'] & self.room_type['suite'] & self.location['ciudad'], self.multiplier['high']),
-            ctrl.Rule(self.season['medium'] & self.room_type['suite'] & self.location['rural'], self.multiplier['medium']),
-            
-            # High season
-            ctrl.Rule(self.season['high'] & self.room_type['double'] & self.location['mar'], self.multiplier['high']),
-            ctrl.Rule(self.season['high'] & self.room_type['double'] & self.location['ciudad'], self.multiplier['high']),
-            ctrl.Rule(self.season['high'] & self.room_type['double'] & self.location['rural'], self.multiplier['medium']),
-            ctrl.Rule(self.season['high'] & self.room_type['deluxe'] & self.location['mar'], self.multiplier['high']),
-            ctrl.Rule(self.season['high'] & self.room_type['deluxe'] & self.location['ciudad'], self.multiplier['high']),
-            ctrl.Rule(self.season['high'] & self.room_type['deluxe'] & self.location['rural'], self.multiplier['medium']),
-            ctrl.Rule(self.season['high'] & self.room_type['suite'] & self.location['mar'], self.multiplier['very_high']),
-            ctrl.Rule(self.season['high'] & self.room_type['suite'] & self.location['ciudad'], self.multiplier['very_high']),
-            ctrl.Rule(self.season['high'] & self.room_type['suite'] & self.location['rural'], self.multiplier['high']),
-        ]
-        
-        self.multiplier_ctrl = ctrl.ControlSystem(self.rules)
-        self.multiplier_simulator = ctrl.ControlSystemSimulation(self.multiplier_ctrl)
+        self.compiled = compiled
+        if compiled:
+            self.season = self.room_type = self.location = self.occupancy = self.multiplier = None
+            self.rules = None
+            self.multiplier_ctrl = None
+            self.multiplier_simulator = None
+        else:
+            # Fuzzy inputs: season, room type, location and occupancy; fuzzy output: price multiplier
+            antecedents, self.multiplier, self.rules = build_skfuzzy(PRICE_MODEL)
+            self.season = antecedents['season']
+            self.room_type = antecedents['room_type']
+            self.location = antecedents['location']
+            self.occupancy = antecedents['occupancy']
+            # Compiling the control system takes seconds with 81 rules, so it waits for the first scalar call
+            self.multiplier_ctrl = None
+            self.multiplier_simulator = None
+
+        # Compiled engine for the batch path, loaded on first use unless running compiled
+        self._engine = self._compile_engine() if compiled else None
 
-    def calculate_multiplier(self, season_value, room, location):
+    def calculate_multiplier(self, season_value, room, location, occupancy=0.0):
         """
-        Computes the multiplier based on season, room type, and location.
+        Computes the multiplier based on season, room type, location and occupancy.
         """
+        if self.compiled:
+            return self._engine.compute(season_value, room, location, occupancy)[()]
+        if self.multiplier_simulator is None:
+            self._build_simulator()
+        start = instrumentation.start() if instrumentation.active else 0
         self.multiplier_simulator.input['season'] = season_value
         self.multiplier_simulator.input['room_type'] = room
         self.multiplier_simulator.input['location'] = location
+        self.multiplier_simulator.input['occupancy'] = occupancy
         self.multiplier_simulator.compute()
+        if start:
+            instrumentation.finish("inference", start)
         return self.multiplier_simulator.output['multiplier']
 
-    def calculated_price(self, season_value, room, location, room_price):
+    def calculated_price(self, season_value, room, location, room_price, occupancy=0.0):
         """
         Calculates the final room price using the computed multiplier.
 
@@ -109,10 +171,70 @@ class PricePercentage:
             room (int): Room type (0: double, 1: deluxe, 2: suite).
             location (int): Location (0: rural, 1: city, 2: sea).
             room_price (float): Base price of the room.
+            occupancy (float): Fraction of the rooms of the type that are booked (0 to 1).
 
         Returns:
             float: Final room price rounded to 2 decimals.
         """
-        final_multiplier = self.calculate_multiplier(season_value, room, location)
-        final_price = room_price * final_multiplier
-        return round(final_price, 2)
+        start = instrumentation.start() if instrumentation.active else 0
+        final_multiplier = self.calculate_multiplier(season_value, room, location, occupancy)
+        final_price = round(room_price * final_multiplier, 2)
+        if start:
+            instrumentation.finish("pricing", start)
+        return final_price
+
+    def calculate_multipliers(self, seasons, rooms, locations, occupancies=0.0):
+        """
+        Computes the multipliers for many (season, room type, location, occupancy) inputs in one pass.
+
+        The rule base is evaluated by the compiled `MamdaniEngine` instead of the skfuzzy
+        simulation. Results are identical to `calculate_multiplier`.
+
+        Args:
+            seasons (array-like): Season values (0: low, 1: medium, 2: high).
+            rooms (array-like): Room type values (0: double, 1: deluxe, 2: suite).
+            locations (array-like): Location values (0: rural, 1: city, 2: sea).
+            occupancies (array-like): Fractions of the rooms booked (0 to 1).
+
+        Returns:
+            numpy.ndarray: Multipliers with the broadcast shape of the inputs.
+        """
+        if self._engine is None:
+            self._engine = self._compile_engine()
+        return self._engine.compute(seasons, rooms, locations, occupancies)
+
+    def calculated_prices(self, seasons, rooms, locations, base_prices, occupancies=0.0):
+        """
+        Calculates final room prices for arrays of inputs in one vectorized pass.
+
+        Args:
+            seasons (array-like): Season values (0: low, 1: medium, 2: high).
+            rooms (array-like): Room type values (0: double, 1: deluxe, 2: suite).
+            locations (array-like): Location values (0: rural, 1: city, 2: sea).
+            base_prices (array-like): Base prices of the rooms.
+            occupancies (array-like): Fractions of the rooms booked (0 to 1).
+
+        Returns:
+            numpy.ndarray: Final room prices rounded to 2 decimals, identical to
+            `calculated_price`.
+        """
+        start = instrumentation.start() if instrumentation.active else 0
+        multipliers = self.calculate_multipliers(seasons, rooms, locations, occupancies)
+        prices = np.round(np.asarray(base_prices, dtype=np.float64) * multipliers, 2)
+        if start:
+            instrumentation.finish("pricing", start)
+        return prices
+
+    def _build_simulator(self):
+        """
+        Builds the skfuzzy control system and simulation of the rules.
+        """
+        from skfuzzy import control as ctrl
+        self.multiplier_ctrl = ctrl.ControlSystem(self.rules)
+        self.multiplier_simulator = ctrl.ControlSystemSimulation(self.multiplier_ctrl)
+
+    def _compile_engine(self):
+        """
+        Loads the compiled `MamdaniEngine` of `PRICE_MODEL`, building its artifact if missing or stale.
+        """
+        return load_engine(PRICE_MODEL, "pricing")
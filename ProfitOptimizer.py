@@ -0,0 +1,279 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from Hotel_pkg.PricePercentage import PricePercentage
+from Hotel_pkg.hotel_env import ROOM_TYPES
+from Hotel_pkg.Payroll import Payroll
+
+class DemandModel:
+    """
+    Price-elastic demand for hotel rooms.
+
+    Occupancy of a room type is its base occupancy for the season and location,
+    scaled by (price / reference price) ** -elasticity and capped at 100%. The
+    reference price is the fuzzy price, so a multiplier of 1 gives the base occupancy.
+    """
+
+    def __init__(self, season_occupancy=(0.45, 0.65, 0.9), location_factor=(0.85, 1.0, 1.1),
+                 elasticity=1.6, season_days=(150, 120, 95)):
+        """
+        Initializes the demand model.
+
+        Args:
+            season_occupancy (tuple): Base occupancy per season (low, medium, high).
+            location_factor (tuple): Occupancy factor per location (rural, city, sea).
+            elasticity (float): Price elasticity of demand.
+            season_days (tuple): Nights per year in each season.
+        """
+        self.season_occupancy = np.asarray(season_occupancy, dtype=np.float64)
+        self.location_factor = np.asarray(location_factor, dtype=np.float64)
+        self.elasticity = elasticity
+        self.season_days = np.asarray(season_days, dtype=np.float64)
+
+    def base_occupancy(self, locations, seasons):
+        """
+        Returns the occupancy at the reference price.
+
+        Args:
+            locations (array-like): Location of each hotel, shape (H,).
+            seasons (array-like): Seasons to evaluate, shape (S,).
+
+        Returns:
+            numpy.ndarray: Base occupancy, shape (H, S).
+        """
+        return np.clip(self.location_factor[np.asarray(locations)][:, None]
+                       * self.season_occupancy[np.asarray(seasons)][None, :], 0.0, 1.0)
+
+    def occupancy(self, base_occupancy, multipliers):
+        """
+        Returns the occupancy for given price multipliers.
+
+        Args:
+            base_occupancy (numpy.ndarray): Occupancy at the reference price, broadcastable to `multipliers`.
+            multipliers (numpy.ndarray): Price multipliers over the fuzzy price.
+
+        Returns:
+            numpy.ndarray: Occupancy between 0 and 1.
+        """
+        return np.minimum(base_occupancy * multipliers ** -self.elasticity, 1.0)
+
+
+def _block_profit(multipliers, block, elasticity):
+    """
+    Yearly profit of every particle for a block of hotels.
+
+    Args:
+        multipliers (numpy.ndarray): Price multipliers, shape (H, P, T).
+        block (dict): Arrays describing the hotels of the block (see `ProfitOptimizer._blocks`).
+        elasticity (float): Price elasticity of demand.
+
+    Returns:
+        numpy.ndarray: Profit per hotel and particle, shape (H, P).
+    """
+    x = multipliers[..., None]                                  # (H, P, T, 1)
+    prices = block["prices"][:, None] * x                       # (H, P, T, S)
+    occupancy = np.minimum(block["base_occupancy"][:, None, None, :] * x ** -elasticity, 1.0)
+    margin = prices - block["room_night_cost"][:, None, None, None]
+    room_nights = block["rooms"][:, None, :, None] * occupancy * block["season_days"]
+    return (room_nights * margin).sum(axis=(2, 3)) - block["fixed_payroll"][:, None]
+
+
+def _optimize_block(block):
+    """
+    Runs one particle swarm per hotel of a block, all hotels evaluated together.
+
+    Follows the velocity update of pyswarm's `pso` (inertia `omega`, cognitive
+    `phip` and social `phig` weights, bounds enforced by clipping).
+
+    Args:
+        block (dict): Hotel arrays plus the swarm settings and the block's seed.
+
+    Returns:
+        tuple: (best multipliers (H, T), best profit (H,)).
+    """
+    rng = np.random.default_rng(block["seed"])
+    lower, upper = block["bounds"]
+    hotels, types = block["rooms"].shape
+    shape = (hotels, block["swarmsize"], types)
+
+    position = rng.uniform(lower, upper, shape)
+    position[:, 0] = 1.0  # Seed every swarm with the current fuzzy prices
+    velocity = rng.uniform(-(upper - lower), upper - lower, shape)
+
+    best_position = position.copy()
+    best_profit = _block_profit(position, block, block["elasticity"])
+    leader = best_profit.argmax(axis=1)
+    global_position = best_position[np.arange(hotels), leader]
+    global_profit = best_profit[np.arange(hotels), leader]
+    converged = np.zeros(hotels, dtype=bool)
+
+    for _ in range(block["maxiter"]):
+        rp = rng.uniform(size=shape)
+        rg = rng.uniform(size=shape)
+        velocity = (block["omega"] * velocity
+                    + block["phip"] * rp * (best_position - position)
+                    + block["phig"] * rg * (global_position[:, None] - position))
+        position = np.clip(position + velocity, lower, upper)
+
+        profit = _block_profit(position, block, block["elasticity"])
+        improved = profit > best_profit
+        best_position[improved] = position[improved]
+        best_profit[improved] = profit[improved]
+
+        leader = best_profit.argmax(axis=1)
+        candidate = best_profit[np.arange(hotels), leader]
+        gain = candidate - global_profit
+        global_position = best_position[np.arange(hotels), leader]
+        global_profit = candidate
+
+        # Like pyswarm, a swarm has converged once its best improves by no more than minfunc
+        converged |= (gain > 0) & (gain <= block["minfunc"])
+        if converged.all():
+            break
+
+    return global_position, global_profit
+
+
+class ProfitOptimizer:
+    """
+    Finds the per-hotel, per-room-type price multipliers that maximize the chain's yearly profit.
+
+    Revenue comes from the fuzzy `PricePercentage` prices times the multipliers and
+    a price-elastic `DemandModel`, over all the seasons. Costs are the `EmployeeSalary`
+    payroll: fixed staff plus housekeeping paid per occupied room-night. Each hotel has its
+    own particle swarm; swarms are evaluated in vectorized blocks of hotels and the blocks
+    are spread across a process pool.
+    """
+
+    # Default staff per room of each job position level, and their base monthly salary
+    STAFF_PER_ROOM = {1: 0.4, 3: 0.15, 4: 0.06, 5: 0.03}
+    BASE_SALARY = 1200.0
+    # Occupied room-nights one junior employee services per month
+    ROOM_NIGHTS_PER_HOUSEKEEPER = 300
+
+    def __init__(self, hotels, demand=None, seasons=(0, 1, 2), payroll=None):
+        """
+        Prepares the pricing, demand and payroll data of the chain.
+
+        Args:
+            hotels (list): `Ht_distribution` objects of the chain.
+            demand (DemandModel, optional): Demand model. Defaults to `DemandModel()`.
+            seasons (tuple): Seasons included in the yearly profit.
+            payroll (Payroll, optional): Payroll engine. Defaults to one on the shared salary model.
+        """
+        self.hotels = list(hotels)
+        self.demand = demand if demand is not None else DemandModel()
+        self.seasons = np.asarray(seasons)
+        payroll = payroll if payroll is not None else Payroll()
+
+        stars = np.array([h.stars for h in self.hotels], dtype=np.int64)
+        locations = np.array([h.location for h in self.hotels], dtype=np.int64)
+        configs = [h.room_config() for h in self.hotels]
+        # Reshaped so an empty chain still has one column per room type
+        self.rooms = np.array([quantities for quantities, _ in configs], dtype=np.float64).reshape(-1, len(ROOM_TYPES))
+        base_prices = np.array([prices for _, prices in configs], dtype=np.float64).reshape(-1, len(ROOM_TYPES))
+
+        # Fuzzy prices for every hotel, room type and season in one batched call, shape (H, T, S)
+        pricing = PricePercentage(compiled=True)
+        self.prices = pricing.calculated_prices(self.seasons[None, None, :],
+                                                np.arange(len(ROOM_TYPES))[None, :, None],
+                                                locations[:, None, None],
+                                                base_prices[:, :, None])
+        self.base_occupancy = self.demand.base_occupancy(locations, self.seasons)
+
+        self.fixed_payroll, self.room_night_cost = self.staff_costs(stars, self.rooms.sum(axis=1), payroll)
+
+    @classmethod
+    def staff_costs(cls, stars, total_rooms, payroll):
+        """
+        Calculates the payroll of each hotel's default staff.
+
+        Args:
+            stars (numpy.ndarray): Star rating of each hotel.
+            total_rooms (numpy.ndarray): Number of rooms of each hotel.
+            payroll (Payroll): Payroll engine.
+
+        Returns:
+            tuple: (yearly fixed payroll, housekeeping cost per occupied room-night), one value per hotel.
+        """
+        fixed_payroll = np.zeros(len(stars))
+        for position, per_room in cls.STAFF_PER_ROOM.items():
+            salaries = payroll.final_salaries(position, stars, cls.BASE_SALARY)
+            fixed_payroll += 12 * salaries * np.round(total_rooms * per_room)
+        room_night_cost = payroll.final_salaries(1, stars, cls.BASE_SALARY) / cls.ROOM_NIGHTS_PER_HOUSEKEEPER
+        return fixed_payroll, room_night_cost
+
+    def _blocks(self, block_size, settings, seed):
+        """
+        Splits the chain into blocks of hotels, each with its own seed. An empty chain is one empty block.
+        """
+        hotels = max(len(self.hotels), 1)
+        seeds = np.random.SeedSequence(seed).spawn(-(-hotels // block_size))
+        for index, start in enumerate(range(0, hotels, block_size)):
+            rows = slice(start, start + block_size)
+            yield dict(settings,
+                       prices=self.prices[rows],
+                       rooms=self.rooms[rows],
+                       base_occupancy=self.base_occupancy[rows],
+                       fixed_payroll=self.fixed_payroll[rows],
+                       room_night_cost=self.room_night_cost[rows],
+                       season_days=self.demand.season_days[self.seasons],
+                       elasticity=self.demand.elasticity,
+                       seed=seeds[index])
+
+    def profit(self, multipliers):
+        """
+        Calculates the yearly profit of each hotel for given price multipliers.
+
+        Args:
+            multipliers (array-like): Price multipliers, shape (H, T).
+
+        Returns:
+            numpy.ndarray: Profit per hotel, shape (H,).
+        """
+        block = next(self._blocks(max(len(self.hotels), 1), {}, None))
+        multipliers = np.asarray(multipliers, dtype=np.float64).reshape(-1, self.prices.shape[1])
+        return _block_profit(multipliers[:, None], block, block["elasticity"])[:, 0]
+
+    def optimize(self, bounds=(0.5, 2.0), swarmsize=30, maxiter=100, omega=0.5, phip=0.5, phig=0.5,
+                 minfunc=1e-6, processes=None, block_size=500, seed=None):
+        """
+        Runs the particle swarm optimization over the whole chain.
+
+        Args:
+            bounds (tuple): Lower and upper bounds of the price multipliers.
+            swarmsize (int): Particles per hotel.
+            maxiter (int): Maximum number of iterations.
+            omega (float): Particle velocity scaling factor.
+            phip (float): Scaling factor to search away from the particle's best known position.
+            phig (float): Scaling factor to search away from the swarm's best known position.
+            minfunc (float): A hotel's swarm has converged once its best profit improves by no more than this.
+            processes (int, optional): Worker processes. Defaults to the CPU count; 1 runs inline.
+            block_size (int): Hotels evaluated together in one vectorized block.
+            seed (int, optional): Seed for reproducible results.
+
+        Returns:
+            dict: "multipliers" (H, T), "prices" (H, T, S), "occupancy" (H, T, S), "profit" per hotel,
+                  "total_profit", and "baseline_profit" with every multiplier at 1.
+        """
+        settings = dict(bounds=bounds, swarmsize=swarmsize, maxiter=maxiter,
+                        omega=omega, phip=phip, phig=phig, minfunc=minfunc)
+        blocks = list(self._blocks(block_size, settings, seed))
+        processes = processes if processes is not None else os.cpu_count() or 1
+
+        if processes == 1 or len(blocks) == 1:
+            results = [_optimize_block(block) for block in blocks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(processes, len(blocks))) as pool:
+                results = list(pool.map(_optimize_block, blocks))
+
+        multipliers = np.concatenate([position for position, _ in results])
+        profit = np.concatenate([value for _, value in results])
+        return {
+            "multipliers": multipliers,
+            "prices": np.round(self.prices * multipliers[:, :, None], 2),
+            "occupancy": self.demand.occupancy(self.base_occupancy[:, None, :], multipliers[:, :, None]),
+            "profit": profit,
+            "total_profit": float(profit.sum()),
+            "baseline_profit": float(self.profit(np.ones_like(multipliers)).sum()),
+        }
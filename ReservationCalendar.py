@@ -0,0 +1,208 @@
+from datetime import date, timedelta
+import numpy as np
+
+class ReservationCalendar:
+    """
+    Date-ranged reservation calendar for the rooms of a hotel.
+
+    Each room carries a per-night occupancy bitmap packed into uint64 words
+    (bit `i` of word `w` is night `64 * w + i` of the horizon), so availability
+    over a stay is checked for all rooms of a type with vectorized bitwise ops.
+
+    The calendar is a separate schedule, not connected to a `Hotel`'s inventory:
+    stays booked here do not take rooms in `Hotel.rooms`, are not counted by
+    `HotelChain` and are not written to a `HotelStore` journal, and `Hotel.get_room`
+    still books a room with no dates. A hotel's rooms should be booked through one
+    or the other, and a calendar is not persisted.
+    """
+
+    WORD_BITS = 64
+
+    def __init__(self, room_types, start=None, horizon=365):
+        """
+        Initializes an empty calendar.
+
+        Args:
+            room_types (list): Room type of each room, indexed by room id.
+            start (datetime.date, optional): First night of the horizon. Defaults to today.
+            horizon (int): Number of nights covered by the calendar (e.g. 365 or 730).
+        """
+        self.start = start if start is not None else date.today()
+        self.horizon = horizon
+        self.room_types = list(room_types)
+
+        words = -(-horizon // self.WORD_BITS)
+        self.occupancy = np.zeros((len(self.room_types), words), dtype=np.uint64)
+
+        # Room ids of each type, used to query a whole type at once
+        type_ids = {}
+        for room_id, room_type in enumerate(self.room_types):
+            type_ids.setdefault(room_type, []).append(room_id)
+        self.type_rooms = {room_type: np.array(ids, dtype=np.intp) for room_type, ids in type_ids.items()}
+
+    @classmethod
+    def from_hotel(cls, hotel, start=None, horizon=365):
+        """
+        Creates a calendar with the same rooms and room ids as a `Hotel`. The hotel is not
+        updated by bookings made in the calendar.
+
+        Args:
+            hotel (Hotel): Hotel whose rooms are scheduled.
+            start (datetime.date, optional): First night of the horizon. Defaults to today.
+            horizon (int): Number of nights covered by the calendar.
+
+        Returns:
+            ReservationCalendar: The empty calendar.
+        """
+        return cls(hotel.room_types, start, horizon)
+
+    def _night(self, check_in):
+        """
+        Converts a check-in date or night offset into a night index.
+        """
+        if isinstance(check_in, date):
+            return (check_in - self.start).days
+        return int(check_in)
+
+    def _span(self, check_in, nights):
+        """
+        Returns the first word, last word (exclusive) and per-word bit masks covering a stay.
+
+        Raises:
+            ValueError: If the stay is empty or falls outside the calendar horizon.
+        """
+        first = self._night(check_in)
+        last = first + nights
+        if nights < 1 or first < 0 or last > self.horizon:
+            raise ValueError(f"Stay of {nights} nights from night {first} is outside the {self.horizon}-night horizon")
+
+        first_word, last_word = first // self.WORD_BITS, (last - 1) // self.WORD_BITS + 1
+        masks = []
+        for word in range(first_word, last_word):
+            low = max(first - word * self.WORD_BITS, 0)
+            high = min(last - word * self.WORD_BITS, self.WORD_BITS)
+            masks.append(((1 << high) - 1) ^ ((1 << low) - 1))
+        return first_word, last_word, np.array(masks, dtype=np.uint64)
+
+    def free_rooms(self, room_type, check_in, nights):
+        """
+        Finds every room of a type that is free for a whole stay.
+
+        Args:
+            room_type (str): Type of room.
+            check_in (datetime.date or int): Check-in date, or night offset from `start`.
+            nights (int): Number of nights of the stay.
+
+        Returns:
+            numpy.ndarray: Ids of the free rooms, in ascending order.
+        """
+        rooms = self.type_rooms.get(room_type)
+        if rooms is None:
+            return np.empty(0, dtype=np.intp)
+        first_word, last_word, masks = self._span(check_in, nights)
+        busy = (self.occupancy[rooms, first_word:last_word] & masks).any(axis=1)
+        return rooms[~busy]
+
+    def is_available(self, room_type, check_in, nights):
+        """
+        Checks whether any room of a type is free for a whole stay.
+
+        Args:
+            room_type (str): Type of room.
+            check_in (datetime.date or int): Check-in date, or night offset from `start`.
+            nights (int): Number of nights of the stay.
+
+        Returns:
+            bool: True if at least one room is free.
+        """
+        return self.free_rooms(room_type, check_in, nights).size > 0
+
+    def book(self, room_type, check_in, nights):
+        """
+        Books the first room of a type that is free for a whole stay.
+
+        Args:
+            room_type (str): Type of room to book.
+            check_in (datetime.date or int): Check-in date, or night offset from `start`.
+            nights (int): Number of nights of the stay.
+
+        Returns:
+            int: Id of the booked room, or None if no room of that type is free.
+        """
+        free = self.free_rooms(room_type, check_in, nights)
+        if free.size == 0:
+            return None
+        room_id = int(free[0])
+        first_word, last_word, masks = self._span(check_in, nights)
+        self.occupancy[room_id, first_word:last_word] |= masks
+        return room_id
+
+    def cancel(self, room_id, check_in, nights):
+        """
+        Cancels a stay, freeing its nights in a room.
+
+        Args:
+            room_id (int): Id of the booked room.
+            check_in (datetime.date or int): Check-in date, or night offset from `start`.
+            nights (int): Number of nights of the stay.
+
+        Returns:
+            bool: True if every night of the stay was booked, False otherwise (nothing is changed).
+        """
+        first_word, last_word, masks = self._span(check_in, nights)
+        words = self.occupancy[room_id, first_word:last_word]
+        if not np.array_equal(words & masks, masks):
+            return False
+        self.occupancy[room_id, first_word:last_word] = words & ~masks
+        return True
+
+    def _nights(self, rooms, check_in, nights):
+        """
+        Unpacks the occupancy of some rooms over a range into a (rooms, nights) bool array.
+        """
+        first_word, last_word, _ = self._span(check_in, nights)
+        bits = np.unpackbits(self.occupancy[rooms, first_word:last_word].astype('<u8').view(np.uint8),
+                             axis=1, bitorder='little')
+        offset = self._night(check_in) - first_word * self.WORD_BITS
+        return bits[:, offset:offset + nights].astype(bool)
+
+    def booked_per_night(self, room_type, check_in, nights):
+        """
+        Counts the booked rooms of a type for each night of a range.
+
+        Args:
+            room_type (str): Type of room.
+            check_in (datetime.date or int): First night of the range, as a date or night offset.
+            nights (int): Number of nights in the range.
+
+        Returns:
+            numpy.ndarray: Booked room count per night.
+        """
+        rooms = self.type_rooms.get(room_type, np.empty(0, dtype=np.intp))
+        return self._nights(rooms, check_in, nights).sum(axis=0)
+
+    def room_schedule(self, room_id, check_in, nights):
+        """
+        Returns the occupancy of a single room over a range.
+
+        Args:
+            room_id (int): Id of the room.
+            check_in (datetime.date or int): First night of the range, as a date or night offset.
+            nights (int): Number of nights in the range.
+
+        Returns:
+            numpy.ndarray: Bool array, True for the booked nights.
+        """
+        return self._nights([room_id], check_in, nights)[0]
+
+    def night_date(self, night):
+        """
+        Converts a night offset into its date.
+
+        Args:
+            night (int): Night offset from `start`.
+
+        Returns:
+            datetime.date: Date of that night.
+        """
+        return self.start + timedelta(days=night)
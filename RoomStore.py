@@ -0,0 +1,110 @@
+from array import array
+
+class RoomStore:
+    """
+    Compact struct-of-arrays storage for the rooms of a hotel.
+
+    Rooms are identified by their index. Each room only costs a 1-byte room type
+    code, a 1-byte availability flag and a 4-byte slot in its type's free stack;
+    names and prices are stored once per room type.
+
+    Availability uses one byte per room rather than one bit: a packed bit would
+    share its byte with neighbouring rooms, and updating it would need a lock
+    around every booking.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty store.
+        """
+        self.type_names = []            # Room type name of each type code
+        self.type_codes = {}            # Type code of each room type name
+        self.prices = array('d')        # Price per night of each type code
+        self.codes = array('B')         # Type code of each room, indexed by room id
+        self.available = bytearray()    # 1 if the room is free, 0 if booked, indexed by room id
+        self.free = []                  # Stack of free room ids (int32) per type code
+
+    def add_rooms(self, room_type, num, price):
+        """
+        Appends rooms of a type, all of them free.
+
+        Args:
+            room_type (str): Type of the rooms.
+            num (int): Number of rooms to add.
+            price (float): Price per night of the room type.
+
+        Returns:
+            int: Type code of the room type.
+
+        Raises:
+            ValueError: If more than 256 room types are used.
+        """
+        code = self.type_codes.get(room_type)
+        if code is None:
+            if len(self.type_names) == 256:
+                raise ValueError("A hotel cannot have more than 256 room types")
+            code = self.type_codes[room_type] = len(self.type_names)
+            self.type_names.append(room_type)
+            self.prices.append(price)
+            self.free.append(array('i'))
+        else:
+            self.prices[code] = price
+
+        first = len(self.codes)
+        self.codes.extend(array('B', [code]) * num)
+        self.available.extend(b'\x01' * num)
+        # Reversed so rooms are handed out in creation order
+        self.free[code] = array('i', range(first + num - 1, first - 1, -1)) + self.free[code]
+        return code
+
+    @classmethod
+    def from_arrays(cls, type_names, prices, codes, available, free):
+        """
+        Builds a store from its buffers, e.g. columns loaded from a snapshot.
+
+        Args:
+            type_names (list): Room type name of each type code.
+            prices (sequence): Price per night of each type code.
+            codes (bytes-like): Type code of each room (uint8).
+            available (bytes-like): Availability flag of each room (uint8).
+            free (list): Free room ids (int32 bytes-like) of each type code, top of the stack last.
+
+        Returns:
+            RoomStore: The store, with its own copy of the buffers.
+        """
+        store = cls()
+        store.type_names = list(type_names)
+        store.type_codes = {name: code for code, name in enumerate(store.type_names)}
+        store.prices = array('d', prices)
+        store.codes = array('B', bytes(codes))
+        store.available = bytearray(available)
+        store.free = []
+        for stack in free:
+            ids = array('i')
+            ids.frombytes(bytes(stack))
+            store.free.append(ids)
+        return store
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, room_id):
+        """
+        Returns a room in the dictionary shape used by `Hotel.rooms_config`.
+        """
+        code = self.codes[room_id]
+        return {"room_type": self.type_names[code], "price": self.prices[code],
+                "available": bool(self.available[room_id])}
+
+    def __iter__(self):
+        names, prices = self.type_names, self.prices
+        for code, available in zip(self.codes, self.available):
+            yield {"room_type": names[code], "price": prices[code], "available": bool(available)}
+
+    def nbytes(self):
+        """
+        Returns the size of the per-room and per-type buffers in bytes.
+        """
+        return (self.codes.itemsize * len(self.codes) + len(self.available)
+                + self.prices.itemsize * len(self.prices)
+                + sum(free.itemsize * len(free) for free in self.free))
@@ -0,0 +1,71 @@
+import argparse
+import random
+import time
+from Hotel_pkg.BatchAllocator import BatchAllocator
+from Hotel_pkg.Guest import Guest
+from Hotel_pkg.Hotel import Hotel
+
+# Rooms and price per night of each type, scaled by --rooms
+ROOMS = {"double": (0.55, 100.0), "deluxe": (0.27, 150.0), "suite": (0.18, 200.0)}
+# Share of requests for each type: at the default sizes doubles and deluxes are oversold, while
+# about 800 of the 1800 suites are left for upgrades
+DEMAND = (0.8, 0.15, 0.05)
+# Share of guests accepting another type at its own price, few enough to leave suites for upgrades
+ACCEPTING = 0.05
+
+
+def build_hotel(rooms):
+    return Hotel("allocation", 5, {room_type: (round(rooms * share), price)
+                                   for room_type, (share, price) in ROOMS.items()}, 1, rooms * 2)
+
+
+def build_guests(requests, max_nights=7, seed=0):
+    """
+    Draws guests with 1 to `max_nights` nights, an `ACCEPTING` share of them accepting another type.
+    """
+    rng = random.Random(seed)
+    types = list(ROOMS)
+    guests, acceptable = [], {}
+    for i in range(requests):
+        room_type = rng.choices(types, DEMAND)[0]
+        guests.append(Guest(i, f"guest-{i}", rng.randint(1, max_nights), room_type))
+        if rng.random() < ACCEPTING:
+            acceptable[i] = (rng.choice(types),)
+    return guests, acceptable
+
+
+def first_come_first_served(hotel, guests):
+    revenue = 0.0
+    for guest in guests:
+        if guest.book_room(hotel):
+            revenue += round(hotel.room_price(guest.room_type) * guest.nights_at_hotel, 2)
+    return round(revenue, 2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compares batch allocation with first-come-first-served booking.")
+    parser.add_argument("--rooms", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--max-nights", type=int, nargs="+", default=[7, 30, 120, 365],
+                        help="Longest stay of each run; longer stays make more request classes")
+    args = parser.parse_args(argv)
+
+    for max_nights in args.max_nights:
+        print(f"Stays of 1 to {max_nights} nights:")
+        guests, acceptable = build_guests(args.requests, max_nights)
+        hotel = build_hotel(args.rooms)
+        start = time.perf_counter()
+        revenue = first_come_first_served(hotel, guests)
+        elapsed = time.perf_counter() - start
+        print(f"  First come, first served:  revenue {revenue:>16,.2f}  {args.requests / elapsed:>10,.0f} requests/s")
+
+        for upgrades in (False, True):
+            hotel = build_hotel(args.rooms)
+            start = time.perf_counter()
+            result = BatchAllocator(hotel, upgrades=upgrades).allocate_guests(guests, acceptable)
+            elapsed = time.perf_counter() - start
+            label = "Batch, with upgrades:" if upgrades else "Batch, no upgrades:"
+            print(f"  {label:<26} revenue {result['revenue']:>16,.2f}  {args.requests / elapsed:>10,.0f} requests/s")
+
+if __name__ == "__main__":
+    main()
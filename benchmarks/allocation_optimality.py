@@ -0,0 +1,76 @@
+import argparse
+import random
+import sys
+import numpy as np
+from scipy.optimize import linprog
+from Hotel_pkg.BatchAllocator import _max_revenue_flow
+
+
+def random_instance(rng, max_classes, max_types):
+    """
+    Draws supplies, free rooms and arcs with revenues in cents, some classes and types left unconnected.
+    """
+    classes, types = rng.randint(1, max_classes), rng.randint(1, max_types)
+    supply = [rng.randint(1, 50) for _ in range(classes)]
+    free = [rng.randint(0, 60) for _ in range(types)]
+    arcs = [(c, t, rng.randint(1, 365) * rng.randint(5000, 40000))
+            for c in range(classes) for t in range(types) if rng.random() < 0.5]
+    return supply, free, arcs
+
+
+def linprog_revenue(supply, free, arcs):
+    """
+    Solves the same transportation problem as a linear program; its optimum is integral.
+    """
+    if not arcs:
+        return 0
+    rows = np.zeros((len(supply) + len(free), len(arcs)))
+    for j, (c, t, _) in enumerate(arcs):
+        rows[c, j] = rows[len(supply) + t, j] = 1
+    result = linprog([-revenue for _, _, revenue in arcs], A_ub=rows, b_ub=supply + free, bounds=(0, None),
+                     method="highs")
+    return round(-result.fun)
+
+
+def check(supply, free, arcs):
+    """
+    Returns a description of what is wrong with the flow of an instance, or None.
+    """
+    flows = _max_revenue_flow(supply, free, arcs)
+    revenues = {(c, t): revenue for c, t, revenue in arcs}
+    if any(key not in revenues or amount <= 0 for key, amount in flows.items()):
+        return f"flow on a missing arc: {flows}"
+    for c, count in enumerate(supply):
+        if sum(amount for (flow_c, _), amount in flows.items() if flow_c == c) > count:
+            return f"class {c} oversupplied"
+    for t, count in enumerate(free):
+        if sum(amount for (_, flow_t), amount in flows.items() if flow_t == t) > count:
+            return f"type {t} overbooked"
+    revenue = sum(amount * revenues[key] for key, amount in flows.items())
+    expected = linprog_revenue(supply, free, arcs)
+    if revenue != expected:
+        return f"revenue {revenue}, linprog {expected}"
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Checks that batch allocation flows match scipy's linprog optimum.")
+    parser.add_argument("--instances", type=int, default=500)
+    parser.add_argument("--classes", type=int, default=40, help="Maximum request classes per instance")
+    parser.add_argument("--types", type=int, default=8, help="Maximum room types per instance")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+    failures = 0
+    for instance in range(args.instances):
+        supply, free, arcs = random_instance(rng, args.classes, args.types)
+        problem = check(supply, free, arcs)
+        if problem:
+            failures += 1
+            if failures <= 10:
+                print(f"  instance {instance}: {problem}")
+    print(f"{args.instances} instances, {failures} not optimal")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Short-lived worker: price one hotel, compute one salary, report whether skfuzzy was loaded
+WORKER = """
+import sys
+from Hotel_pkg.hotel_env import Ht_distribution
+from Hotel_pkg.Employee import Employee
+hotel = Ht_distribution("cold", 5, 2, 100).room_pricing(2)
+Employee(1, 5, 1200.0, 3).monthly_salary()
+print("skfuzzy" in sys.modules)
+"""
+
+
+def run_worker(artifacts):
+    """
+    Runs the worker in a fresh interpreter.
+
+    Args:
+        artifacts (str): Artifact directory given to the worker.
+
+    Returns:
+        tuple: (wall time in seconds, whether skfuzzy was imported).
+    """
+    env = dict(os.environ, HOTEL_FUZZY_ARTIFACTS=artifacts)
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", WORKER], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return time.perf_counter() - start, output.strip().endswith("True")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as artifacts:
+        elapsed, skfuzzy = run_worker(artifacts)
+        print(f"Cold start, artifacts built: {elapsed * 1000:.0f} ms (skfuzzy imported: {skfuzzy})")
+        runs = [run_worker(artifacts) for _ in range(5)]
+        elapsed = min(t for t, _ in runs)
+        skfuzzy = any(imported for _, imported in runs)
+        print(f"Cold start, artifacts cached: {elapsed * 1000:.0f} ms (skfuzzy imported: {skfuzzy})")
+
+if __name__ == "__main__":
+    main()
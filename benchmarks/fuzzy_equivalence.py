@@ -0,0 +1,69 @@
+import argparse
+import itertools
+import sys
+import numpy as np
+from Hotel_pkg.PricePercentage import PricePercentage
+from Hotel_pkg.EmployeeSalary import EmployeeSalary
+
+# Occupancies of the integer grid: empty, the band boundaries and full
+GRID_OCCUPANCIES = (0.0, 0.5, 0.8, 1.0)
+
+
+def reference(compute):
+    """
+    Runs one skfuzzy inference, returning NaN where no rule fires (skfuzzy raises there).
+    """
+    try:
+        return compute()
+    except (ValueError, KeyError, AssertionError):
+        return np.nan
+
+
+def compare(name, inputs, expected, actual):
+    """
+    Reports inputs where the compiled engine differs from skfuzzy, bit for bit.
+
+    Returns:
+        int: Number of mismatches.
+    """
+    expected, actual = np.asarray(expected), np.asarray(actual)
+    same = (expected == actual) | (np.isnan(expected) & np.isnan(actual))
+    for index in np.flatnonzero(~same)[:10]:
+        print(f"  {name}{tuple(inputs[index])}: skfuzzy {expected[index]!r}, compiled {actual[index]!r}")
+    print(f"{name}: {len(same)} inputs, {int((~same).sum())} mismatches")
+    return int((~same).sum())
+
+
+def check_pricing(samples, rng):
+    reference_model, compiled = PricePercentage(), PricePercentage(compiled=True)
+    grid = list(itertools.product(range(3), range(3), range(3), GRID_OCCUPANCIES))
+    randoms = np.column_stack([rng.uniform(0, 2, samples), rng.uniform(0, 2, samples),
+                               rng.uniform(0, 2, samples), rng.uniform(0, 1, samples)]).tolist()
+    inputs = np.array(grid + randoms)
+    expected = [reference(lambda: reference_model.calculate_multiplier(*values)) for values in inputs.tolist()]
+    # Batched, as the chain prices hotels
+    actual = compiled.calculate_multipliers(*inputs.T)
+    return compare("PricePercentage", inputs, expected, actual)
+
+
+def check_salary(samples, rng):
+    reference_model, compiled = EmployeeSalary(), EmployeeSalary(compiled=True)
+    grid = list(itertools.product(range(1, 6), range(3, 6)))
+    randoms = np.column_stack([rng.uniform(1, 5, samples), rng.uniform(3, 5, samples)]).tolist()
+    inputs = np.array(grid + randoms)
+    expected = [reference(lambda: reference_model.salary_calculator(*values, 1.0)) for values in inputs.tolist()]
+    actual = compiled.salary_multipliers(*inputs.T)
+    return compare("EmployeeSalary", inputs, expected, actual)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Checks that the compiled fuzzy engine matches skfuzzy exactly.")
+    parser.add_argument("--samples", type=int, default=100, help="Random continuous inputs per model")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(args.seed)
+    mismatches = check_pricing(args.samples, rng) + check_salary(args.samples, rng)
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
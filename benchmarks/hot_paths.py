@@ -0,0 +1,402 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+import numpy as np
+from Hotel_pkg.Hotel import Hotel
+from Hotel_pkg.HotelChain import HotelChain
+from Hotel_pkg.PricePercentage import PricePercentage
+from Hotel_pkg.hotel_env import Ht_distribution, ROOM_TYPES
+from Hotel_pkg.Employee import Employee
+from Hotel_pkg.Payroll import Payroll, get_salary_model
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+ROOM_SIZES = (10, 100, 1000, 10000, 100000)
+CHAIN_EMPLOYEES = 10000
+CHAIN_HOTELS = 10000
+# Share of the rooms of each type, as in a 5-star hotel (30/15/10)
+TYPE_SHARE = (30 / 55, 15 / 55, 10 / 55)
+# Minimum timed duration of one sample; short operations are repeated on fresh state until reached
+MIN_SAMPLE_NS = 20_000_000
+
+
+class Benchmark:
+    """
+    One timed operation.
+
+    `setup()` builds fresh state before every call and `run(state)` performs
+    `ops` operations on it; only `run` is timed and results are per operation.
+    Each sample calls `run` on fresh state until it has been timed for at least
+    `MIN_SAMPLE_NS`, so operations of a few microseconds are not lost in timer
+    and scheduler noise. As in `timeit`, the garbage collector is off while a
+    sample runs, so collections of earlier states are not timed.
+    """
+
+    def __init__(self, name, run, setup=lambda: None, ops=1, repeats=20):
+        """
+        Args:
+            name (str): Unique name, used as the key in the results file.
+            run (callable): Called as run(state); performs `ops` operations.
+            setup (callable): Returns the state of one repeat.
+            ops (int): Operations performed by one call of `run`.
+            repeats (int): Number of samples.
+        """
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.ops = ops
+        self.repeats = repeats
+
+    def sample(self, min_sample_ns=MIN_SAMPLE_NS):
+        """
+        Times `run` on fresh state until at least `min_sample_ns` have been timed.
+
+        Returns:
+            float: Time per operation in ns.
+        """
+        elapsed = calls = 0
+        gc.collect()
+        gc.disable()
+        try:
+            while not calls or elapsed < min_sample_ns:
+                state = self.setup()
+                start = time.perf_counter_ns()
+                self.run(state)
+                elapsed += time.perf_counter_ns() - start
+                calls += 1
+        finally:
+            gc.enable()
+        return elapsed / (calls * self.ops)
+
+    def summary(self, samples):
+        """
+        Returns:
+            dict: Per-operation min, median, mean and standard deviation in ns of the samples.
+        """
+        return {
+            "ops": self.ops,
+            "repeats": len(samples),
+            "min_ns": min(samples),
+            "median_ns": statistics.median(samples),
+            "mean_ns": statistics.fmean(samples),
+            "stdev_ns": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        }
+
+    def measure(self, repeats=None, min_sample_ns=MIN_SAMPLE_NS):
+        """
+        Times the benchmark alone, after one untimed warmup call.
+
+        Args:
+            repeats (int, optional): Overrides the number of samples.
+            min_sample_ns (int): Minimum timed duration of one sample.
+
+        Returns:
+            dict: As `summary`.
+        """
+        self.run(self.setup())      # Fills caches, lazy builds and allocator pools outside the samples
+        return self.summary([self.sample(min_sample_ns) for _ in range(repeats or self.repeats)])
+
+
+def measure_suite(benchmarks, min_sample_ns=MIN_SAMPLE_NS):
+    """
+    Times benchmarks in rounds, one sample of each per round, after one untimed warmup call each.
+
+    A slow spell of the machine then costs every benchmark one sample rather than
+    all the samples of a few of them.
+
+    Args:
+        benchmarks (list): `Benchmark` objects.
+        min_sample_ns (int): Minimum timed duration of one sample.
+
+    Returns:
+        dict: Results of `Benchmark.summary` by name, in the order of `benchmarks`.
+    """
+    for benchmark in benchmarks:
+        benchmark.run(benchmark.setup())
+    samples = {benchmark.name: [] for benchmark in benchmarks}
+    for round_ in range(max((benchmark.repeats for benchmark in benchmarks), default=0)):
+        for benchmark in benchmarks:
+            if round_ < benchmark.repeats:
+                samples[benchmark.name].append(benchmark.sample(min_sample_ns))
+    return {benchmark.name: benchmark.summary(samples[benchmark.name]) for benchmark in benchmarks}
+
+
+def hotel_with_rooms(total):
+    """
+    Builds a hotel with about `total` rooms split across the room types like a 5-star hotel.
+    """
+    counts = [max(1, round(total * share)) for share in TYPE_SHARE]
+    return Hotel(f"bench-{total}", 5, {room_type: (num, 100.0 + 50 * i)
+                                        for i, (room_type, num) in enumerate(zip(ROOM_TYPES, counts))}, 2, total)
+
+
+def watched_hotel(total):
+    """
+    Builds a hotel like `hotel_with_rooms`, registered in a chain that watches it.
+    """
+    hotel = hotel_with_rooms(total)
+    HotelChain().add_hotel(hotel)
+    return hotel
+
+
+def _drain(hotel):
+    """
+    Books every room of a hotel through `get_room`, cycling over the room types.
+    """
+    for room_type in ROOM_TYPES:
+        for _ in range(hotel.free_count(room_type)):
+            hotel.get_room(room_type)
+
+
+def _reprice(hotel, ops=1000):
+    for i in range(ops):
+        hotel.price_setting(100.0 + (i & 7), ROOM_TYPES[i % 3])
+
+
+def build_suite(quick=False):
+    """
+    Lists the benchmarks of the pricing, booking and payroll hot paths.
+
+    Args:
+        quick (bool): Use fewer repeats and smaller chains, for a fast smoke run.
+
+    Returns:
+        list: `Benchmark` objects.
+    """
+    repeats = 5 if quick else 20
+    suite = [Benchmark("PricePercentage.__init__", lambda _: PricePercentage(), repeats=repeats)]
+    pricing = PricePercentage()
+    pricing.calculated_price(0, 0, 0, 100.0)   # Builds the skfuzzy simulation outside the timings
+    suite.append(Benchmark("PricePercentage.calculated_price",
+                           lambda _: [pricing.calculated_price(s, r, 2, 150.0) for s in range(3) for r in range(3)],
+                           ops=9, repeats=repeats))
+
+    for stars in (3, 4, 5):
+        env = Ht_distribution(f"bench-{stars}", stars, 1, 100)
+        suite.append(Benchmark(f"Ht_distribution.room_pricing[{stars}]",
+                               lambda _, env=env: env.room_pricing(2), repeats=repeats))
+        # Alternates seasons so every call reprices; templates are cached after the first repeat
+        suite.append(Benchmark(f"Ht_distribution.roll_season[{stars}]",
+                               lambda hotel: [Ht_distribution.roll_season(hotel, season % 3) for season in range(100)],
+                               setup=lambda env=env: env.room_pricing(2), ops=100, repeats=repeats))
+
+    for total in ROOM_SIZES:
+        if quick and total > 10000:
+            continue
+        rooms = sum(max(1, round(total * share)) for share in TYPE_SHARE)
+        # Hotels are built in setup, so only the bookings are timed
+        suite.append(Benchmark(f"Hotel.get_room[{total}]", _drain,
+                               setup=lambda total=total: hotel_with_rooms(total),
+                               ops=rooms, repeats=repeats))
+        suite.append(Benchmark(f"Hotel.price_setting[{total}]", _reprice,
+                               setup=lambda total=total: hotel_with_rooms(total),
+                               ops=1000, repeats=repeats))
+
+    hotels_count = CHAIN_HOTELS // 10 if quick else CHAIN_HOTELS
+    hotels = [Ht_distribution(f"bench-{i}", 3 + i % 3, i % 3, 100).room_pricing(i % 3) for i in range(hotels_count)]
+    chain = HotelChain()
+    for hotel in hotels:
+        chain.add_hotel(hotel)
+    for i, hotel in enumerate(hotels):
+        hotel.book_room(ROOM_TYPES[i % 3])
+    suite.append(Benchmark(f"HotelChain.to_dataframe[{hotels_count}]", lambda _: chain.to_dataframe(),
+                           repeats=repeats))
+    suite.append(Benchmark("Hotel.get_room[watched]", _drain,
+                           setup=lambda: watched_hotel(1000),
+                           ops=sum(max(1, round(1000 * share)) for share in TYPE_SHARE), repeats=repeats))
+
+    employees_count = CHAIN_EMPLOYEES // 10 if quick else CHAIN_EMPLOYEES
+    rng = np.random.default_rng(0)
+    positions = rng.choice([1, 3, 4, 5], employees_count)
+    ratings = rng.integers(3, 6, employees_count)
+    employees = [Employee(i, int(rating), 1200.0, int(position))
+                 for i, (position, rating) in enumerate(zip(positions, ratings))]
+    get_salary_model()  # Build the shared model outside the timings
+    suite.append(Benchmark(f"Employee.monthly_salary[{employees_count}]",
+                           lambda _: [employee.monthly_salary(update=False) for employee in employees],
+                           ops=employees_count, repeats=max(3, repeats // 4)))
+    payroll = Payroll()
+    # Updating compounds the salaries, so every call starts again from the same ones
+    suite.append(Benchmark(f"Payroll.employee_salaries[{employees_count}]",
+                           lambda _: payroll.employee_salaries(employees, update=True),
+                           setup=lambda: [setattr(employee, "salary", 1200.0) for employee in employees],
+                           ops=employees_count, repeats=repeats))
+    return suite
+
+
+def environment():
+    """
+    Describes the machine and library versions the results were measured on.
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def combine(runs):
+    """
+    Merges the results of the same suite measured in several worker processes.
+
+    Hash seeds, memory layout and short bursts of a shared machine shift the fastest
+    sample of a process by up to half from one process to the next, while the median
+    of its samples moves far less. "median_ns", the statistic compared against the
+    baseline, is therefore the median over the processes of each process's median.
+
+    Args:
+        runs (list): Results of `measure_suite`, one per process; a process may have
+                     measured only some of the benchmarks.
+
+    Returns:
+        dict: Per benchmark, "median_ns", the overall "min_ns" and the per-process results as "runs".
+    """
+    results = {}
+    for name in dict.fromkeys(name for run in runs for name in run):
+        summaries = [run[name] for run in runs if name in run]
+        results[name] = {
+            "ops": summaries[0]["ops"],
+            "processes": len(summaries),
+            "median_ns": statistics.median(summary["median_ns"] for summary in summaries),
+            "min_ns": min(summary["min_ns"] for summary in summaries),
+            "runs": summaries,
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares the "median_ns" of each benchmark against a baseline (see `combine`).
+
+    Args:
+        results (dict): Benchmark results by name.
+        baseline (dict): Baseline results by name.
+        threshold (float): Relative slowdown above which a benchmark is a regression (0.2 = 20%).
+
+    Returns:
+        list: (name, baseline median, current median, ratio, status) tuples, where status is
+              "regression", "improvement", "ok" or "new".
+    """
+    rows = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None or "processes" not in reference:
+            rows.append((name, None, result["median_ns"], None, "new"))
+            continue
+        ratio = result["median_ns"] / reference["median_ns"]
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append((name, reference["median_ns"], result["median_ns"], ratio, status))
+    return rows
+
+
+def run_workers(processes, quick=False, name_filter="", names=()):
+    """
+    Measures the suite in worker processes, each in a fresh interpreter.
+
+    Args:
+        processes (int): Number of worker processes, run one after another.
+        quick (bool): As in `build_suite`.
+        name_filter (str): Only measure benchmarks whose name contains this text.
+        names (iterable): Only measure benchmarks with these names, when given.
+
+    Returns:
+        list: Results of `measure_suite`, one per process.
+    """
+    command = [sys.executable, os.path.abspath(__file__), "--worker", f"--filter={name_filter}"]
+    command += [f"--benchmark={name}" for name in names]
+    if quick:
+        command.append("--quick")
+    return [json.loads(subprocess.run(command, stdout=subprocess.PIPE, text=True, check=True).stdout)
+            for _ in range(max(1, processes))]
+
+
+def _format_ns(ns):
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks of the pricing, booking and payroll hot paths.")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"),
+                        help="JSON file the results are written to")
+    parser.add_argument("--baseline", default=os.path.join(RESULTS_DIR, "baseline.json"),
+                        help="JSON results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Also store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative slowdown of the median time flagged as a regression")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="Fewer repeats and smaller sizes")
+    parser.add_argument("--processes", type=int, default=4, help="Worker processes the suite is measured in")
+    parser.add_argument("--rechecks", type=int, default=2,
+                        help="Times a flagged regression is measured again in --processes more processes before "
+                             "it is reported")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--benchmark", action="append", default=[], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        json.dump(measure_suite([benchmark for benchmark in build_suite(args.quick) if args.filter in benchmark.name
+                                 and (not args.benchmark or benchmark.name in args.benchmark)]), sys.stdout)
+        return 0
+    runs = run_workers(args.processes, args.quick, args.filter)
+    results = combine(runs)
+    for name, result in results.items():
+        print(f"{name:<40} {_format_ns(result['median_ns']):>12} per op")
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["benchmarks"]
+        # A slow spell of the machine can push a few medians over the threshold; a real
+        # regression stays over it once more processes are pooled in
+        for _ in range(args.rechecks):
+            flagged = [row[0] for row in compare(results, baseline, args.threshold) if row[4] == "regression"]
+            if not flagged:
+                break
+            print(f"Measuring {len(flagged)} flagged benchmark(s) again")
+            runs += run_workers(args.processes, args.quick, args.filter, flagged)
+            results = combine(runs)
+
+    document = {"environment": environment(), "benchmarks": results}
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(document, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    regressions = 0
+    print(f"\nAgainst {args.baseline} (threshold {args.threshold:.0%}):")
+    for name, before, after, ratio, status in compare(results, baseline, args.threshold):
+        change = f"{ratio:.2f}x" if ratio is not None else "-"
+        before = _format_ns(before) if before is not None else "-"
+        print(f"{name:<40} {before:>12} -> {_format_ns(after):>12} {change:>7}  {status}")
+        regressions += status == "regression"
+    if regressions:
+        print(f"{regressions} regression(s) found")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from Hotel_pkg.Hotel import Hotel
+from Hotel_pkg.Ingestion import ingest
+
+ROOM_TYPES = ("double", "deluxe", "suite", "penthouse")  # "penthouse" is unknown to the hotel
+
+
+def write_feed(path, requests, seed=0):
+    """
+    Writes a synthetic CSV feed of booking requests.
+    """
+    rng = random.Random(seed)
+    with open(path, "w", newline="") as f:
+        f.write("id,name,nights_at_hotel,room_type\n")
+        for i in range(requests):
+            f.write(f"{i},guest{i},{rng.randint(0, 14)},{rng.choice(ROOM_TYPES)}\n")
+
+
+def run(path, rooms, output, trace=False):
+    """
+    Ingests a feed into a fresh hotel, returning (summary, seconds, peak traced bytes).
+    """
+    hotel = Hotel("ingest", 5, {"double": (rooms, 100.0), "deluxe": (rooms // 2, 150.0),
+                                "suite": (rooms // 4, 200.0)}, 2, rooms)
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    summary = ingest(path, hotel, output)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    tracemalloc.stop()
+    return summary, elapsed, peak
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for requests in (100000, 1000000):
+            feed = os.path.join(directory, f"feed-{requests}.csv")
+            write_feed(feed, requests)
+            # Untraced run for throughput, traced run for peak memory
+            hotel_rooms = requests // 2
+            summary, elapsed, _ = run(feed, hotel_rooms, os.path.join(directory, "results.csv"))
+            _, _, peak = run(feed, hotel_rooms, os.path.join(directory, "results.csv"), trace=True)
+            print(f"{requests:>9,} requests: {requests / elapsed:,.0f} requests/s, "
+                  f"{summary['accepted']:,} accepted, peak {peak / 1e6:.1f} MB traced")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import gc
+import tracemalloc
+from Hotel_pkg.Hotel import Hotel
+from Hotel_pkg.hotel_env import ROOM_CONFIGS, ROOM_TYPES
+from Hotel_pkg.Guest import Guest
+
+HOTELS = 2000
+GUESTS = 500000
+
+
+class DictGuest:
+    """
+    Guest with a per-instance __dict__, as `Guest` was before __slots__.
+    """
+
+    def __init__(self, id, name, nights_at_hotel, room_type):
+        self.id = id
+        self.name = name
+        self.nights_at_hotel = nights_at_hotel
+        self.room_type = room_type
+
+
+def dict_rooms(rooms_config):
+    """
+    Builds one dictionary per room, as `Hotel.rooms_config` was stored before `RoomStore`.
+    """
+    return [
+        {"room_type": room_type, "price": base_price, "available": True}
+        for room_type, (num, base_price) in rooms_config.items()
+        for _ in range(num)
+    ]
+
+
+def measure(build):
+    """
+    Returns the bytes still allocated by the result of `build`.
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def five_star_rooms():
+    """
+    Room configuration of a 5-star hotel, as built by `Ht_distribution.room_pricing`.
+    """
+    quantities, base_prices = ROOM_CONFIGS[5]
+    return {room_type: (num, float(price)) for room_type, num, price in zip(ROOM_TYPES, quantities, base_prices)}
+
+
+def report(label, before, after, count, unit):
+    print(f"{label}: {before / count:,.1f} -> {after / count:,.1f} bytes per {unit} "
+          f"({before / after:.1f}x smaller, {before / 2**20:,.1f} MiB -> {after / 2**20:,.1f} MiB)")
+
+
+def main():
+    config = five_star_rooms()
+    rooms = HOTELS * sum(num for num, _ in config.values())
+
+    # Only the room storage is compared; the hotel objects themselves are the same size
+    before = measure(lambda: [dict_rooms(config) for _ in range(HOTELS)])
+    after = measure(lambda: [Hotel(f"hotel{i}", 5, config, 2, 100).rooms for i in range(HOTELS)])
+    report(f"Rooms ({HOTELS} five-star hotels)", before, after, rooms, "room")
+
+    names = [f"guest{i}" for i in range(GUESTS)]
+    before = measure(lambda: [DictGuest(i, names[i], 3, "suite") for i in range(GUESTS)])
+    after = measure(lambda: [Guest(i, names[i], 3, "suite") for i in range(GUESTS)])
+    report(f"Guests ({GUESTS:,})", before, after, GUESTS, "guest")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import random
+import sys
+import tempfile
+import time
+from Hotel_pkg.HotelStore import HotelStore
+from Hotel_pkg.hotel_env import Ht_distribution, ROOM_TYPES
+
+HOTELS = 10000
+OPERATIONS = 200000
+
+
+def build_chain(hotels):
+    """
+    Prices a chain of hotels with every star rating and location, with occupancy pricing.
+    """
+    return [Ht_distribution(f"hotel-{i}", 3 + i % 3, i % 3, 100).room_pricing(i % 3) for i in range(hotels)]
+
+
+def churn(hotels, operations, seed=0):
+    """
+    Books and releases rooms at random across the chain.
+    """
+    rng = random.Random(seed)
+    held = [[] for _ in hotels]
+    for _ in range(operations):
+        index = rng.randrange(len(hotels))
+        if held[index] and rng.random() < 0.3:
+            hotels[index].release_room(held[index].pop(rng.randrange(len(held[index]))))
+        else:
+            room_id = hotels[index].book_room(rng.choice(ROOM_TYPES))
+            if room_id is not None:
+                held[index].append(room_id)
+
+
+def state(hotel):
+    """
+    Returns everything recovery must restore for a hotel.
+    """
+    rooms = hotel.rooms
+    return (hotel.name, hotel.stars, hotel.location, hotel.capacity, hotel.season, rooms.type_names,
+            rooms.prices.tolist(), rooms.codes.tobytes(), bytes(rooms.available),
+            [sorted(free) for free in rooms.free], hotel.bands, hotel.band_prices, hotel.band_limits)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Times the recovery of a journaled chain.")
+    parser.add_argument("--hotels", type=int, default=HOTELS)
+    parser.add_argument("--operations", type=int, default=OPERATIONS,
+                        help="Bookings and releases after the last snapshot, replayed from the journal")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    hotels = build_chain(args.hotels)
+    print(f"Built {len(hotels)} hotels ({sum(len(h.rooms) for h in hotels)} rooms) "
+          f"in {time.perf_counter() - start:.2f} s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = HotelStore(directory, snapshot_records=0)
+        start = time.perf_counter()
+        store.add_hotels(hotels)
+        print(f"Snapshot: {(time.perf_counter() - start) * 1000:.0f} ms")
+        churn(hotels, args.operations // 2, seed=1)
+        store.snapshot()
+        start = time.perf_counter()
+        churn(hotels, args.operations, seed=2)
+        elapsed = time.perf_counter() - start
+        print(f"Journaled {args.operations} operations: {args.operations / elapsed:,.0f} ops/s")
+
+        # Simulated crash: the journal is made durable but the store is never closed
+        store.sync()
+        records = store.journal.records
+        start = time.perf_counter()
+        recovered = HotelStore.open(directory, sync_interval=0)
+        elapsed = time.perf_counter() - start
+        print(f"Recovered {len(recovered.hotels)} hotels, replaying {records} journal records: {elapsed * 1000:.0f} ms")
+        recovered.close()
+        store.close()
+
+        mismatches = sum(state(a) != state(b) for a, b in zip(hotels, recovered.hotels))
+        if mismatches or len(hotels) != len(recovered.hotels):
+            print(f"{mismatches} hotels differ after recovery")
+            return 1
+        print("Recovered state matches")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import asyncio
+import random
+import sys
+import threading
+import time
+from Hotel_pkg.Hotel import Hotel
+
+ROOMS = {"double": (300, 100.0), "deluxe": (150, 150.0), "suite": (50, 200.0)}
+THREADS = 16
+TASKS = 64
+OPERATIONS = 5000
+
+
+def check_inventory(hotel, held):
+    """
+    Asserts that every room is either free or held by exactly one client.
+    """
+    held_ids = [room_id for rooms in held for room_id in rooms]
+    assert len(held_ids) == len(set(held_ids)), "A room was booked twice"
+
+    free_ids = [room_id for free in hotel.free_rooms.values() for room_id in free]
+    free_set = set(free_ids)
+    assert len(free_ids) == len(free_set), "A room is free twice"
+    assert free_set.isdisjoint(held_ids), "A booked room is also free"
+    assert len(free_ids) + len(held_ids) == len(hotel.room_types), "Rooms were lost"
+
+    for room_id, available in enumerate(hotel.available):
+        assert available == (room_id in free_set), f"Room {room_id} has a stale availability flag"
+    for room_type, (num, _) in ROOMS.items():
+        booked = sum(1 for room_id in held_ids if hotel.room_types[room_id] == room_type)
+        assert booked + len(hotel.free_rooms[room_type]) == num, f"Inventory of {room_type} is not conserved"
+
+
+def client(hotel, seed, held):
+    """
+    Books and releases rooms at random, keeping the ids it holds in `held`.
+    """
+    rng = random.Random(seed)
+    types = list(ROOMS)
+    for _ in range(OPERATIONS):
+        if held and rng.random() < 0.4:
+            assert hotel.release_room(held.pop(rng.randrange(len(held))))
+        else:
+            room_id = hotel.book_room(rng.choice(types))
+            if room_id is not None:
+                held.append(room_id)
+
+
+def stress_threads():
+    """
+    Hammers one hotel from many threads.
+    """
+    hotel = Hotel("stress", 5, ROOMS, 2, 1000)
+    held = [[] for _ in range(THREADS)]
+    threads = [threading.Thread(target=client, args=(hotel, seed, held[seed])) for seed in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    check_inventory(hotel, held)
+
+
+async def async_client(hotel, seed, held):
+    """
+    Async version of `client`, yielding to the event loop between operations.
+    """
+    rng = random.Random(seed)
+    types = list(ROOMS)
+    for _ in range(OPERATIONS // 10):
+        if held and rng.random() < 0.4:
+            assert await hotel.release_room_async(held.pop(rng.randrange(len(held))))
+        else:
+            room_id = await hotel.book_room_async(rng.choice(types))
+            if room_id is not None:
+                held.append(room_id)
+        await asyncio.sleep(0)
+
+
+def stress_asyncio_and_threads():
+    """
+    Hammers one hotel from asyncio tasks while threads book it concurrently.
+    """
+    hotel = Hotel("stress", 5, ROOMS, 2, 1000)
+    thread_held = [[] for _ in range(THREADS // 2)]
+    task_held = [[] for _ in range(TASKS)]
+
+    async def run_tasks():
+        await asyncio.gather(*(async_client(hotel, 1000 + seed, task_held[seed]) for seed in range(TASKS)))
+
+    threads = [threading.Thread(target=client, args=(hotel, seed, thread_held[seed]))
+               for seed in range(len(thread_held))]
+    for thread in threads:
+        thread.start()
+    asyncio.run(run_tasks())
+    for thread in threads:
+        thread.join()
+    check_inventory(hotel, thread_held + task_held)
+
+
+def uncontended_throughput():
+    """
+    Measures single-threaded bookings and releases per second.
+    """
+    hotel = Hotel("throughput", 5, {"double": (200000, 100.0)}, 2, 1000)
+    start = time.perf_counter()
+    room_ids = [hotel.book_room("double") for _ in range(200000)]
+    booking = len(room_ids) / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for room_id in room_ids:
+        hotel.release_room(room_id)
+    release = len(room_ids) / (time.perf_counter() - start)
+    return booking, release
+
+
+def main():
+    # Switch threads as often as possible to maximise interleavings
+    sys.setswitchinterval(1e-6)
+    stress_threads()
+    print(f"Threads: inventory conserved with {THREADS} threads x {OPERATIONS} operations")
+    stress_asyncio_and_threads()
+    print(f"Asyncio: inventory conserved with {TASKS} tasks and {THREADS // 2} threads")
+    sys.setswitchinterval(0.005)
+    booking, release = uncontended_throughput()
+    print(f"Uncontended: {booking:,.0f} bookings/s, {release:,.0f} releases/s")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,48 @@
+from functools import lru_cache
 from Hotel_pkg.Hotel import Hotel
-from Hotel_pkg.PricePercentage import PricePercentage
+import numpy as np
+from Hotel_pkg.PricePercentage import get_pricing_model, OCCUPANCY_BANDS
+
+# Room types in the order used by the fuzzy pricing (0: double, 1: deluxe, 2: suite)
+ROOM_TYPES = ("double", "deluxe", "suite")
+
+# Room quantities and base prices (double, deluxe, suite) per star rating
+ROOM_CONFIGS = {
+    3: ((10, 7, 3), (30, 50, 70)),
+    4: ((20, 10, 5), (70, 100, 150)),
+    5: ((30, 15, 10), (100, 150, 200)),
+}
+
+# Maximum number of (stars, location, season) profiles kept by `room_template`
+TEMPLATE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def room_template(stars, location, season):
+    """
+    Prices the rooms of a hotel profile, shared by every hotel with the same stars, location and season.
+
+    Templates are cached with least-recently-used eviction, so a chain prices each profile
+    once; call `room_template.cache_clear()` if the pricing model changes.
+
+    Args:
+        stars (int): Star rating of the hotel. Ratings other than 3 or 4 stars use the 5-star configuration.
+        location (int): Numeric location value.
+        season (int): Numeric season value.
+
+    Returns:
+        tuple: (quantities, band_prices), each ordered as `ROOM_TYPES`: the number of rooms of each
+               type and its prices at the lower bound of every occupancy band (the first one being
+               the price of the empty hotel).
+    """
+    quantities, base_prices = ROOM_CONFIGS.get(stars, ROOM_CONFIGS[5])
+
+    # Price the three room types at the lower bound of every occupancy band in a single batched call
+    occupancies = np.array((0.0,) + tuple(OCCUPANCY_BANDS))
+    band_prices = get_pricing_model().calculated_prices(season, np.arange(len(ROOM_TYPES))[:, None], location,
+                                                        np.asarray(base_prices)[:, None], occupancies[None, :])
+    return tuple(quantities), tuple(map(tuple, band_prices.tolist()))
+
 
 class Ht_distribution:
     """
@@ -22,42 +65,67 @@ class Ht_distribution:
         self.location = location
         self.capacity = capacity
 
-    def room_pricing(self, season) -> Hotel:
+    def room_config(self):
+        """
+        Returns the room quantities and base prices for the hotel's star rating.
+
+        Returns:
+            tuple: (quantities, base_prices), each ordered as `ROOM_TYPES`.
+                   Ratings other than 3 or 4 stars use the 5-star configuration.
+        """
+        return ROOM_CONFIGS.get(self.stars, ROOM_CONFIGS[5])
+
+    def room_pricing(self, season, occupancy_pricing=True) -> Hotel:
         """
         Sets up room pricing and quantity based on the season and star rating of the hotel.
 
         Args:
             season (int): Numeric season value (used in fuzzy logic for price calculation).
+            occupancy_pricing (bool): If True, the hotel reprices each room type as its occupancy
+                                      crosses the `OCCUPANCY_BANDS` boundaries.
 
         Returns:
             Hotel: A `Hotel` object initialized with calculated room prices and quantities.
         """
-        # Create an instance of PricePercentage for price calculation
-        obj_pricing = PricePercentage()
-
-        # Determine room configuration based on the star rating of the hotel
-        if self.stars == 3:
-            # 3-star hotel configuration
-            rooms_quantity = {
-                "double": (10, obj_pricing.calculated_price(season, 0, self.location, 30)),
-                "deluxe": (7, obj_pricing.calculated_price(season, 1, self.location, 50)),
-                "suite": (3, obj_pricing.calculated_price(season, 2, self.location, 70))
-            }
-        elif self.stars == 4:
-            # 4-star hotel configuration
-            rooms_quantity = {
-                "double": (20, obj_pricing.calculated_price(season, 0, self.location, 70)),
-                "deluxe": (10, obj_pricing.calculated_price(season, 1, self.location, 100)),
-                "suite": (5, obj_pricing.calculated_price(season, 2, self.location, 150))
-            }
-        else:
-            # 5-star hotel configuration
-            rooms_quantity = {
-                "double": (30, obj_pricing.calculated_price(season, 0, self.location, 100)),
-                "deluxe": (15, obj_pricing.calculated_price(season, 1, self.location, 150)),
-                "suite": (10, obj_pricing.calculated_price(season, 2, self.location, 200))
-            }
+        # Priced once per (stars, location, season) and shared across the chain
+        quantities, band_prices = room_template(self.stars, self.location, season)
+        rooms_quantity = {
+            room_type: (num, prices[0])
+            for room_type, num, prices in zip(ROOM_TYPES, quantities, band_prices)
+        }
 
         # Create and return a `Hotel` object with the configured room details
         hotel = Hotel(self.name, self.stars, rooms_quantity, self.location, self.capacity)
+        hotel.season = season
+        if occupancy_pricing:
+            hotel.set_occupancy_pricing(dict(zip(ROOM_TYPES, band_prices)))
+        return hotel
+
+    @staticmethod
+    def roll_season(hotel, new_season):
+        """
+        Reprices an existing hotel for a new season, keeping its bookings.
+
+        Prices come from the cached template of the hotel's stars, location and the new season.
+        A hotel with occupancy pricing gets the new band prices and stays in its current bands;
+        otherwise each room type takes the new season's starting price. Watchers are notified
+        as for any other price change, and a journaled hotel records the season and band tables.
+
+        Args:
+            hotel (Hotel): Hotel to reprice, with the room types of `ROOM_TYPES`.
+            new_season (int): Numeric season value.
+
+        Returns:
+            Hotel: The same hotel.
+        """
+        # Set first, so watchers notified by the repricing see the new season
+        hotel.set_season(new_season)
+        _, band_prices = room_template(hotel.stars, hotel.location, new_season)
+        prices = {room_type: table for room_type, table in zip(ROOM_TYPES, band_prices)
+                  if room_type in hotel.rooms.type_codes}
+        if hotel.band_limits:
+            hotel.set_occupancy_pricing(prices)
+        else:
+            for room_type, table in prices.items():
+                hotel.price_setting(table[0], room_type)
         return hotel
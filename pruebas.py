@@ -1,10 +1,12 @@
 from Hotel_pkg.hotel_env import Ht_distribution
+from Hotel_pkg.Instrumentation import instrumentation, PrintSink
 from Guest import Guest
 
 
 
 
 def main():
+    instrumentation.add_sink(PrintSink())
     guest1=Guest(id="086429", name="Marta", nights_at_hotel=7, room_type="suite")
     env = Ht_distribution("name", 5, 2, 2)
     hotel1=env.room_pricing(2)